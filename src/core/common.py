@@ -9,7 +9,8 @@ import math
 
 def is_cash(symbol: str) -> bool:
     """Check if symbol represents a cash position (e.g., JPY.CASH, USD.CASH)."""
-    return symbol.upper().endswith(".CASH")
+    # Upper-case only the 5-char tail instead of the whole symbol
+    return symbol[-5:].upper() == ".CASH"
 
 
 def is_etf(stock_detail: dict) -> bool:
@@ -22,13 +23,13 @@ def is_etf(stock_detail: dict) -> bool:
     if stock_detail.get("quoteType") == "ETF":
         return True
     info = stock_detail.get("info", stock_detail)
-    has_sector = bool(info.get("sector"))
-    has_net_income = bool(stock_detail.get("net_income_stmt"))
-    has_operating_cf = bool(stock_detail.get("operating_cashflow"))
-    has_revenue_hist = bool(stock_detail.get("revenue_history"))
-    if not has_sector and not has_net_income and not has_operating_cf and not has_revenue_hist:
-        return True
-    return False
+    # Stop at the first fundamental present (sector settles most stocks)
+    return not (
+        info.get("sector")
+        or stock_detail.get("net_income_stmt")
+        or stock_detail.get("operating_cashflow")
+        or stock_detail.get("revenue_history")
+    )
 
 
 def safe_float(value, default: float = 0.0) -> float:
@@ -36,12 +37,13 @@ def safe_float(value, default: float = 0.0) -> float:
 
     Handles None, NaN, Inf, and non-numeric strings.
     """
+    # Fast path: most callers pass plain floats straight from yfinance dicts
+    if type(value) is float:
+        return value if math.isfinite(value) else default
     if value is None:
         return default
     try:
         f = float(value)
-        if math.isnan(f) or math.isinf(f):
-            return default
-        return f
     except (TypeError, ValueError):
         return default
+    return f if math.isfinite(f) else default
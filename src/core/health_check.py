@@ -14,6 +14,7 @@ import math
 
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Optional
 
 from src.core.common import is_cash as _is_cash, is_etf as _is_etf
@@ -72,13 +73,21 @@ def check_trend_health(hist: Optional[pd.DataFrame]) -> dict:
 
     from src.core.screening.technicals import compute_rsi
 
-    sma50 = close.rolling(window=50).mean()
-    sma200 = close.rolling(window=200).mean()
+    # Cross event detection (below) looks back at most 60 trading days
+    _CROSS_LOOKBACK = 60
+    max_scan = min(_CROSS_LOOKBACK, len(close) - 201)
+
+    # Only the last max_scan+1 SMA values are ever read, so average just
+    # those trailing windows (NaN in a window -> NaN, as with rolling().mean())
+    close_arr = close.to_numpy(dtype=np.float64)
+    n_sma = max(0, max_scan) + 1
+    sma50 = sliding_window_view(close_arr[-(n_sma + 49):], 50).mean(axis=1)
+    sma200 = sliding_window_view(close_arr[-(n_sma + 199):], 200).mean(axis=1)
     rsi_series = compute_rsi(close, period=14)
 
-    current_price = float(close.iloc[-1])
-    current_sma50 = float(sma50.iloc[-1])
-    current_sma200 = float(sma200.iloc[-1])
+    current_price = float(close_arr[-1])
+    current_sma50 = float(sma50[-1])
+    current_sma200 = float(sma200[-1])
     current_rsi = float(rsi_series.iloc[-1])
 
     price_above_sma50 = current_price > current_sma50
@@ -87,17 +96,15 @@ def check_trend_health(hist: Optional[pd.DataFrame]) -> dict:
     dead_cross = not sma50_above_sma200
 
     # --- Cross event detection (lookback 60 trading days) ---
-    _CROSS_LOOKBACK = 60
     cross_signal = "none"
     days_since_cross = None
     cross_date = None
 
-    max_scan = min(_CROSS_LOOKBACK, len(sma50) - 201)
     for i in range(max(0, max_scan)):
         idx = -1 - i
         prev_idx = idx - 1
-        cur_above = sma50.iloc[idx] > sma200.iloc[idx]
-        prev_above = sma50.iloc[prev_idx] > sma200.iloc[prev_idx]
+        cur_above = sma50[idx] > sma200[idx]
+        prev_above = sma50[prev_idx] > sma200[prev_idx]
 
         if cur_above and not prev_above:
             cross_signal = "golden_cross"
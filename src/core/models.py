@@ -3,13 +3,14 @@
 Dataclasses providing type safety for the main domain objects.
 External interfaces remain dict-based for backward compatibility;
 these classes are used internally and provide to_dict() for conversion.
+All models use ``slots=True`` to keep per-instance memory small.
 """
 
 from dataclasses import asdict, dataclass, field
 from typing import Optional, Union
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """A single portfolio position.
 
@@ -80,7 +81,7 @@ class Position:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ForecastResult:
     """Return estimate for a single stock.
 
@@ -118,7 +119,7 @@ class ForecastResult:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class HealthResult:
     """Health check result for a single holding.
 
@@ -157,7 +158,7 @@ class HealthResult:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class RebalanceAction:
     """A single rebalancing action proposal.
 
@@ -191,7 +192,7 @@ class RebalanceAction:
         return asdict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class YearlySnapshot:
     """1年分のシミュレーション結果 (KIK-366)."""
 
@@ -205,7 +206,7 @@ class YearlySnapshot:
         return asdict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class SimulationResult:
     """複利シミュレーション結果 (KIK-366)."""
 
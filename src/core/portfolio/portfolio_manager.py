@@ -7,7 +7,11 @@ real-time pricing, P&L calculation, and structural analysis.
 import copy
 import csv
 import os
+import sys
+import time
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 from typing import Optional
 
 from src.core.common import is_cash as _is_cash
@@ -45,6 +49,18 @@ CSV_COLUMNS = [
 
 DEFAULT_ACCOUNT = "特定"
 
+# Raw CSV value used when a column (or a trailing cell) is missing,
+# e.g. old CSVs written before the account column existed.
+_COLUMN_DEFAULTS = {
+    "symbol": "",
+    "shares": "0",
+    "cost_price": "0.0",
+    "cost_currency": "JPY",
+    "account": DEFAULT_ACCOUNT,
+    "purchase_date": "",
+    "memo": "",
+}
+
 # FX pairs to fetch for JPY conversion
 _FX_PAIRS = [
     "USDJPY=X",
@@ -66,6 +82,33 @@ _FX_PAIRS = [
 ]
 
 
+@lru_cache(maxsize=10_000)
+def _symbol_key(symbol: str) -> str:
+    """Return the interned, upper-cased symbol used for case-insensitive matching.
+
+    Cached so repeated lookups of the same symbol skip Unicode case mapping,
+    and interned so equal keys compare by identity first.
+    """
+    return sys.intern(symbol.upper())
+
+
+def _today_iso() -> str:
+    """Return today's local date as YYYY-MM-DD without building a datetime."""
+    t = time.localtime()
+    return f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+
+
+def _weighted_average_cost(
+    old_shares: float, old_price: float, new_shares: float, new_price: float
+) -> float:
+    """Return the share-weighted average of two acquisition prices.
+
+    Caller guarantees old_shares + new_shares != 0.
+    """
+    total = old_shares + new_shares
+    return (old_shares * old_price + new_shares * new_price) / total
+
+
 def _fx_symbol_for_currency(currency: str) -> Optional[str]:
     """Return the yfinance FX pair symbol for converting currency to JPY."""
     if currency == "JPY":
@@ -78,9 +121,17 @@ def _fx_symbol_for_currency(currency: str) -> Optional[str]:
 # ---------------------------------------------------------------------------
 
 
+# Parsed-CSV cache for load_portfolio(): {path: ((mtime_ns, size), rows)}.
+# Holds a single entry; save_portfolio() invalidates it.
+_load_cache: dict[str, tuple[tuple[int, int], list[dict]]] = {}
+
+
 def load_portfolio(csv_path: str = DEFAULT_CSV_PATH) -> list[dict]:
     """CSVからポートフォリオを読み込む。
 
+    ファイルの (mtime_ns, size) が前回読み込み時と同じなら再パースせず
+    キャッシュを返す。呼び出し側が変更しても影響しないよう各行はコピー。
+
     Returns
     -------
     list[dict]
@@ -92,24 +143,64 @@ def load_portfolio(csv_path: str = DEFAULT_CSV_PATH) -> list[dict]:
         ファイルが存在しない場合は空リストを返す。
     """
     csv_path = os.path.normpath(csv_path)
-    if not os.path.exists(csv_path):
+    try:
+        st = os.stat(csv_path)
+    except OSError:
         return []
 
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _load_cache.get(csv_path)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, _read_portfolio_csv(csv_path))
+        _load_cache.clear()
+        _load_cache[csv_path] = cached
+    return [dict(pos) for pos in cached[1]]
+
+
+def _read_portfolio_csv(csv_path: str) -> list[dict]:
+    """Parse the portfolio CSV at *csv_path* (must exist)."""
     portfolio: list[dict] = []
     with open(csv_path, "r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return []
+
+        # Resolve column positions once from the header. Columns absent
+        # from the header are appended as virtual columns filled with
+        # their default, so every row can be unpacked positionally.
+        positions = {name: i for i, name in enumerate(header)}
+        defaults = [_COLUMN_DEFAULTS.get(name, "") for name in header]
+        for name in CSV_COLUMNS:
+            if name not in positions:
+                positions[name] = len(defaults)
+                defaults.append(_COLUMN_DEFAULTS[name])
+        width = len(defaults)
+        pick = itemgetter(*(positions[name] for name in CSV_COLUMNS))
+
         for row in reader:
-            position = {
-                "symbol": row.get("symbol", "").strip(),
-                "shares": int(float(row.get("shares", 0))),
-                "cost_price": float(row.get("cost_price", 0.0)),
-                "cost_currency": row.get("cost_currency", "JPY").strip(),
-                "account": row.get("account", DEFAULT_ACCOUNT).strip() or DEFAULT_ACCOUNT,
-                "purchase_date": row.get("purchase_date", "").strip(),
-                "memo": row.get("memo", "").strip(),
-            }
-            if position["symbol"] and position["shares"] > 0:
-                portfolio.append(position)
+            if not row:
+                continue
+            if len(row) < width:
+                row.extend(defaults[len(row):])
+            symbol, shares, cost_price, cost_currency, account, purchase_date, memo = pick(row)
+
+            # Validate symbol/shares first so rejected rows skip dict building
+            symbol = symbol.strip()
+            if not symbol:
+                continue
+            shares = int(float(shares))
+            if shares <= 0:
+                continue
+            portfolio.append({
+                "symbol": symbol,
+                "shares": shares,
+                "cost_price": float(cost_price),
+                "cost_currency": cost_currency.strip(),
+                "account": account.strip() or DEFAULT_ACCOUNT,
+                "purchase_date": purchase_date.strip(),
+                "memo": memo.strip(),
+            })
 
     return portfolio
 
@@ -139,6 +230,7 @@ def save_portfolio(
                     "memo": pos.get("memo", ""),
                 }
             )
+    _load_cache.pop(csv_path, None)
 
 
 # ---------------------------------------------------------------------------
@@ -169,16 +261,18 @@ def add_position(
         更新後のポジション dict
     """
     if purchase_date is None:
-        purchase_date = datetime.now().strftime("%Y-%m-%d")
+        purchase_date = _today_iso()
     account = (account or DEFAULT_ACCOUNT).strip() or DEFAULT_ACCOUNT
 
     portfolio = load_portfolio(csv_path)
 
-    # Search for existing position with same symbol and account
+    # Search for existing position with same symbol and account.
+    # load_portfolio() already normalizes account, so only the symbol
+    # needs case-folding (done once for the lookup key).
+    symbol_key = _symbol_key(symbol)
     existing = None
     for pos in portfolio:
-        pos_account = (pos.get("account") or DEFAULT_ACCOUNT).strip() or DEFAULT_ACCOUNT
-        if pos["symbol"].upper() == symbol.upper() and pos_account == account:
+        if pos["account"] == account and _symbol_key(pos["symbol"]) == symbol_key:
             existing = pos
             break
 
@@ -188,7 +282,7 @@ def add_position(
         old_price = existing["cost_price"]
         total_shares = old_shares + shares
         if total_shares > 0:
-            new_avg = (old_shares * old_price + shares * cost_price) / total_shares
+            new_avg = _weighted_average_cost(old_shares, old_price, shares, cost_price)
         else:
             new_avg = cost_price
 
@@ -238,12 +332,12 @@ def sell_position(
 
     account = ((account or "").strip() or None)
 
+    symbol_key = _symbol_key(symbol)
     matching_indices: list[int] = []
     for i, pos in enumerate(portfolio):
-        pos_account = (pos.get("account") or DEFAULT_ACCOUNT).strip() or DEFAULT_ACCOUNT
-        if pos["symbol"].upper() != symbol.upper():
+        if _symbol_key(pos["symbol"]) != symbol_key:
             continue
-        if account is not None and pos_account != account:
+        if account is not None and pos["account"] != account:
             continue
         matching_indices.append(i)
 
@@ -260,7 +354,7 @@ def sell_position(
 
     target_idx = matching_indices[0]
     target = portfolio[target_idx]
-    target_account = (target.get("account") or DEFAULT_ACCOUNT).strip() or DEFAULT_ACCOUNT
+    target_account = target["account"]
 
     if shares > target["shares"]:
         raise ValueError(
@@ -624,19 +718,19 @@ def merge_positions(
     """
     merged = copy.deepcopy(current)
     symbol_map: dict[str, int] = {
-        p["symbol"].upper(): i for i, p in enumerate(merged)
+        _symbol_key(p["symbol"]): i for i, p in enumerate(merged)
     }
 
     for prop in proposed:
-        key = prop["symbol"].upper()
+        key = _symbol_key(prop["symbol"])
         if key in symbol_map:
             old = merged[symbol_map[key]]
             total = old["shares"] + prop["shares"]
             if total > 0:
-                old["cost_price"] = (
-                    old["shares"] * old["cost_price"]
-                    + prop["shares"] * prop["cost_price"]
-                ) / total
+                old["cost_price"] = _weighted_average_cost(
+                    old["shares"], old["cost_price"],
+                    prop["shares"], prop["cost_price"],
+                )
             old["shares"] = total
         else:
             merged.append({
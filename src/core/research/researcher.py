@@ -5,6 +5,8 @@ Integrates yfinance quantitative data with Grok API qualitative data
 """
 
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from src.core.screening.indicators import calculate_value_score
 
@@ -16,7 +18,14 @@ try:
 except ImportError:
     HAS_GROK = False
 
+# Set after the first Grok API error is reported (suppresses repeats); the
+# lock keeps check-and-set atomic across research_stock's worker threads
 _grok_warned = [False]
+_grok_warned_lock = threading.Lock()
+
+# Long-lived workers for research_stock's two concurrent Grok calls, so the
+# threads are not rebuilt per call (grok_client's pooled Session is shared)
+_GROK_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="grok")
 
 
 def _grok_available() -> bool:
@@ -33,12 +42,14 @@ def _safe_grok_call(func, *args, **kwargs):
     try:
         return func(*args, **kwargs)
     except Exception as e:
-        if not _grok_warned[0]:
+        with _grok_warned_lock:
+            first_error = not _grok_warned[0]
+            _grok_warned[0] = True
+        if first_error:
             print(
                 f"[researcher] Grok API error (subsequent errors suppressed): {e}",
                 file=sys.stderr,
             )
-            _grok_warned[0] = True
         return None
 
 
@@ -153,15 +164,19 @@ def research_stock(symbol: str, yahoo_client_module) -> dict:
     x_sentiment = _empty_sentiment()
 
     if _grok_available():
-        deep = _safe_grok_call(
-            grok_client.search_stock_deep, symbol, company_name
+        # The two Grok calls are independent network round-trips; run them
+        # side by side so the wait is the slower of the two, not the sum
+        deep_future = _GROK_EXECUTOR.submit(
+            _safe_grok_call, grok_client.search_stock_deep, symbol, company_name
         )
+        sent_future = _GROK_EXECUTOR.submit(
+            _safe_grok_call, grok_client.search_x_sentiment, symbol, company_name
+        )
+        deep = deep_future.result()
         if deep is not None:
             grok_research = deep
 
-        sent = _safe_grok_call(
-            grok_client.search_x_sentiment, symbol, company_name
-        )
+        sent = sent_future.result()
         if sent is not None:
             x_sentiment = sent
 
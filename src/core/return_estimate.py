@@ -12,7 +12,9 @@ but portfolio-level estimation does not call Grok API (KIK-369).
 import math
 from typing import Optional
 
-from src.core.common import is_etf as _is_etf_base
+import numpy as np
+
+from src.core.common import is_cash, is_etf as _is_etf_base
 
 try:
     from src.core.health_check import _detect_value_trap
@@ -33,9 +35,7 @@ def _is_etf(stock_detail: dict) -> bool:
     have analyst target prices are never treated as ETFs for return
     estimation purposes (they use the analyst method instead).
     """
-    if stock_detail.get("target_mean_price") is not None:
-        return False
-    return _is_etf_base(stock_detail)
+    return stock_detail.get("target_mean_price") is None and _is_etf_base(stock_detail)
 
 
 def _compute_buyback_yield(stock_detail: dict) -> float:
@@ -97,11 +97,16 @@ def _estimate_from_analyst(stock_detail: dict) -> dict:
         pessimistic = base * 0.5 if base > 0 else base * 1.5
 
     # Spread fix: when all targets are identical or too few analysts,
-    # generate meaningful spread around base
-    if base is not None and optimistic is not None and pessimistic is not None:
-        if optimistic == pessimistic or (analyst_count is not None and analyst_count < 3):
-            optimistic = base * 1.2 if base > 0 else base * 0.8
-            pessimistic = base * 0.8 if base > 0 else base * 1.2
+    # generate meaningful spread around base (the fallback above guarantees
+    # optimistic/pessimistic are set whenever base is)
+    needs_synth = base is not None and (
+        optimistic == pessimistic
+        or (analyst_count is not None and analyst_count < 3)
+    )
+    if needs_synth:
+        hi, lo = (1.2, 0.8) if base > 0 else (0.8, 1.2)
+        optimistic = base * hi
+        pessimistic = base * lo
 
     return {
         "optimistic": optimistic,
@@ -138,27 +143,28 @@ def _estimate_from_history(stock_detail: dict) -> dict:
     """
     price_history = stock_detail.get("price_history")
 
-    if not price_history or len(price_history) < 22:
+    if price_history is None or len(price_history) < 22:
         # Not enough data (need at least ~1 month of daily prices)
         return _empty_estimate("historical")
 
+    # list[float] from yahoo_client, or any float64 buffer (array.array("d"),
+    # ndarray) which np.asarray wraps without copying
+    prices = np.asarray(price_history, dtype=np.float64)
+
     # Compute monthly returns (~21 trading days per month)
-    monthly_returns = []
-    step = 21
-    for i in range(step, len(price_history), step):
-        prev = price_history[i - step]
-        curr = price_history[i]
-        if prev > 0:
-            monthly_returns.append((curr - prev) / prev)
-
-    if not monthly_returns:
+    sampled = prices[::21]
+    prev = sampled[:-1]
+    curr = sampled[1:]
+    valid = prev > 0
+    monthly_returns = (curr[valid] - prev[valid]) / prev[valid]
+
+    n = int(monthly_returns.size)
+    if n == 0:
         return _empty_estimate("historical")
 
-    n = len(monthly_returns)
-
     # CAGR: annualized total return over the full period
-    start_price = price_history[0]
-    end_price = price_history[-1]
+    start_price = float(prices[0])
+    end_price = float(prices[-1])
     if start_price <= 0:
         return _empty_estimate("historical")
 
@@ -169,10 +175,8 @@ def _estimate_from_history(stock_detail: dict) -> dict:
     else:
         cagr = 0.0
 
-    # Annualized volatility from monthly returns (std * sqrt(12))
-    mean_monthly = sum(monthly_returns) / n
-    variance = sum((r - mean_monthly) ** 2 for r in monthly_returns) / max(n - 1, 1)
-    monthly_std = math.sqrt(variance)
+    # Annualized volatility from monthly returns (sample std * sqrt(12))
+    monthly_std = float(monthly_returns.std(ddof=1)) if n > 1 else 0.0
     annual_std = monthly_std * math.sqrt(12)
 
     # Scenarios: base +/- 1 standard deviation, capped at RETURN_CAP
@@ -289,10 +293,28 @@ def estimate_stock_return(
     }
 
 
+def _fetch_stock_data(symbol: str, yahoo_client_module) -> tuple[Optional[dict], list]:
+    """Fetch (stock_detail, news) for one symbol; news only when detail has a price."""
+    stock_detail = yahoo_client_module.get_stock_detail(symbol)
+    if stock_detail is None or not stock_detail.get("price"):
+        return stock_detail, []
+    return stock_detail, yahoo_client_module.get_stock_news(symbol)
+
+
+def _scenario_column(estimates: list[dict], key: str) -> np.ndarray:
+    """Gather one scenario return across positions (None -> 0.0)."""
+    return np.fromiter(
+        (0.0 if (v := e.get(key)) is None else v for e in estimates),
+        dtype=np.float64,
+        count=len(estimates),
+    )
+
+
 def estimate_portfolio_return(csv_path: str, yahoo_client_module) -> dict:
     """Estimate returns for the entire portfolio.
 
-    Fetches detailed data for each position, computes per-stock estimates,
+    Fetches detailed data for each position (once per distinct symbol),
+    computes per-stock estimates,
     and calculates a weighted average for the portfolio.
 
     Parameters
@@ -331,6 +353,16 @@ def estimate_portfolio_return(csv_path: str, yahoo_client_module) -> dict:
     # Fetch FX rates
     fx_rates = get_fx_rates(yahoo_client_module)
 
+    # Fetch detail + news once per distinct non-cash symbol.  Sequential on
+    # purpose: yahoo_client paces each uncached fetch with a 1s sleep, which
+    # only rate-limits Yahoo if calls are not overlapped.
+    fetched: dict[str, tuple[Optional[dict], list]] = {
+        symbol: _fetch_stock_data(symbol, yahoo_client_module)
+        for symbol in dict.fromkeys(
+            pos["symbol"] for pos in portfolio if not is_cash(pos["symbol"])
+        )
+    }
+
     # Process each position
     position_estimates = []
     for pos in portfolio:
@@ -366,8 +398,8 @@ def estimate_portfolio_return(csv_path: str, yahoo_client_module) -> dict:
             })
             continue
 
-        # Get detailed stock data (includes analyst fields)
-        stock_detail = yahoo_client_module.get_stock_detail(symbol)
+        # Detailed stock data (includes analyst fields) and news
+        stock_detail, news = fetched[symbol]
         if stock_detail is None or not stock_detail.get("price"):
             position_estimates.append({
                 "symbol": symbol,
@@ -394,9 +426,6 @@ def estimate_portfolio_return(csv_path: str, yahoo_client_module) -> dict:
             })
             continue
 
-        # Get news
-        news = yahoo_client_module.get_stock_news(symbol)
-
         # X sentiment: always None in portfolio context (KIK-369).
         # Grok API is reserved for /market-research individual deep-dives.
         x_sentiment = None
@@ -419,33 +448,25 @@ def estimate_portfolio_return(csv_path: str, yahoo_client_module) -> dict:
         position_estimates.append(estimate)
 
     # Calculate portfolio-level weighted average returns
-    total_value_jpy = sum(e.get("value_jpy", 0) for e in position_estimates)
-
-    portfolio_optimistic = 0.0
-    portfolio_base = 0.0
-    portfolio_pessimistic = 0.0
-    has_valid = False
-
-    for est in position_estimates:
-        if total_value_jpy <= 0:
-            break
-        weight = est.get("value_jpy", 0) / total_value_jpy
-
-        if est.get("optimistic") is not None:
-            portfolio_optimistic += est["optimistic"] * weight
-            has_valid = True
-        if est.get("base") is not None:
-            portfolio_base += est["base"] * weight
-        if est.get("pessimistic") is not None:
-            portfolio_pessimistic += est["pessimistic"] * weight
-
+    n = len(position_estimates)
+    values = np.fromiter(
+        (e.get("value_jpy", 0) for e in position_estimates), dtype=np.float64, count=n
+    )
+    total_value_jpy = float(values.sum())
+
+    has_valid = total_value_jpy > 0 and any(
+        e.get("optimistic") is not None for e in position_estimates
+    )
     if not has_valid:
         portfolio_return = {"optimistic": None, "base": None, "pessimistic": None}
     else:
         portfolio_return = {
-            "optimistic": round(portfolio_optimistic, 4),
-            "base": round(portfolio_base, 4),
-            "pessimistic": round(portfolio_pessimistic, 4),
+            key: round(
+                float(values @ _scenario_column(position_estimates, key))
+                / total_value_jpy,
+                4,
+            )
+            for key in ("optimistic", "base", "pessimistic")
         }
 
     return {
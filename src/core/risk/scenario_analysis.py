@@ -1,8 +1,12 @@
 """Scenario-based causal chain analysis for portfolio stress testing (KIK-341)."""
 
 import math
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
+import numpy as np
+
 from src.core.common import safe_float as _safe_float
 from src.core.risk.scenario_definitions import (
     SCENARIOS,
@@ -17,10 +21,27 @@ from src.core.ticker_utils import (
 )
 
 # Module-private aliases for internal use
-_TARGET_TO_SECTORS = TARGET_TO_SECTORS
+# (セクター一覧は membership 判定専用なので frozenset に変換しておく)
+_TARGET_TO_SECTORS: dict[str, Optional[frozenset[str]]] = {
+    target: None if sectors is None else frozenset(sectors)
+    for target, sectors in TARGET_TO_SECTORS.items()
+}
 _SUFFIX_TO_REGION = SUFFIX_TO_REGION
 _ETF_ASSET_CLASS = ETF_ASSET_CLASS
 
+# 部分一致用の (エイリアス, シナリオ定義) 一覧（定義順を維持）
+_ALIAS_ITEMS: tuple[tuple[str, dict], ...] = tuple(
+    (alias, SCENARIOS[scenario_key])
+    for alias, scenario_key in SCENARIO_ALIASES.items()
+    if scenario_key in SCENARIOS
+)
+
+# 完全一致用の解決テーブル（SCENARIOS key がエイリアスより優先）
+_RESOLVED: dict[str, dict] = {
+    **{alias.lower(): scenario for alias, scenario in _ALIAS_ITEMS},
+    **{key.lower(): scenario for key, scenario in SCENARIOS.items()},
+}
+
 
 def _get_etf_asset_class(symbol: str, stock_info: dict) -> Optional[str]:
     """Return the ETF asset class if the symbol is a known ETF, else None."""
@@ -40,6 +61,12 @@ def _infer_region(symbol: str, stock_info: dict) -> str:
     country = stock_info.get("country") or stock_info.get("region")
     if country:
         return country
+    return _region_from_symbol(symbol)
+
+
+@lru_cache(maxsize=1024)
+def _region_from_symbol(symbol: str) -> str:
+    """サフィックスから地域を推定する（銘柄ごとにメモ化）。"""
     for suffix, region in _SUFFIX_TO_REGION.items():
         if symbol.endswith(suffix):
             return region
@@ -50,28 +77,26 @@ def _infer_region(symbol: str, stock_info: dict) -> str:
 # 公開API
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=64)
 def resolve_scenario(name: str) -> Optional[dict]:
     """シナリオ名（自然言語含む）からシナリオ定義を解決。
 
     検索順: 完全一致(SCENARIOS key) → 完全一致(エイリアス) → 部分一致(エイリアス)
+    結果は入力文字列ごとにキャッシュする。返り値は SCENARIOS の共有 dict
+    なので呼び出し側で変更しないこと。
     """
     key = name.lower().strip()
 
-    # 1. SCENARIOS キーの完全一致
-    if key in SCENARIOS:
-        return SCENARIOS[key]
-
-    # 2. エイリアスの完全一致
-    alias_key = SCENARIO_ALIASES.get(key) or SCENARIO_ALIASES.get(name)
-    if alias_key and alias_key in SCENARIOS:
-        return SCENARIOS[alias_key]
+    # 1-2. SCENARIOS キー / エイリアスの完全一致
+    scenario = _RESOLVED.get(key)
+    if scenario is not None:
+        return scenario
 
     # 3. エイリアスの部分一致（入力がエイリアスを含む or エイリアスが入力を含む）
     if len(key) >= 2:
-        for alias, scenario_key in SCENARIO_ALIASES.items():
+        for alias, scenario in _ALIAS_ITEMS:
             if alias in key or key in alias:
-                if scenario_key in SCENARIOS:
-                    return SCENARIOS[scenario_key]
+                return scenario
 
     return None
 
@@ -131,7 +156,7 @@ def _match_target(
 
     # セクターベースのマッチング
     sector_list = _TARGET_TO_SECTORS.get(target)
-    if sector_list is not None and sector in (sector_list or []):
+    if sector_list and sector in sector_list:
         return True
 
     # 高配当株: dividend_yield で判定するが、ここでは単純にFalse
@@ -139,6 +164,38 @@ def _match_target(
     return False
 
 
+@dataclass(frozen=True, slots=True)
+class _ScenarioParams:
+    """シナリオのうち銘柄に依存しない値（PF分析では1回だけ取り出す）。"""
+
+    base_shock: float
+    # (effect_group, target, impact, reason)
+    effect_rows: tuple[tuple[str, str, float, str], ...]
+    impact_on_foreign: float
+    usd_jpy_change: float
+
+
+def _scenario_params(scenario: dict) -> _ScenarioParams:
+    """SCENARIOS の1エントリから _ScenarioParams を作る。"""
+    effects = scenario.get("effects", {})
+    currency_data = effects.get("currency", {})
+    return _ScenarioParams(
+        base_shock=_safe_float(scenario.get("base_shock")),
+        effect_rows=tuple(
+            (
+                effect_group,
+                effect.get("target", ""),
+                _safe_float(effect.get("impact")),
+                effect.get("reason", ""),
+            )
+            for effect_group in ("primary", "secondary")
+            for effect in effects.get(effect_group, [])
+        ),
+        impact_on_foreign=_safe_float(currency_data.get("impact_on_foreign")),
+        usd_jpy_change=_safe_float(currency_data.get("usd_jpy_change")),
+    )
+
+
 def compute_stock_scenario_impact(
     stock_info: dict,
     sensitivity: dict,
@@ -171,6 +228,15 @@ def compute_stock_scenario_impact(
             "causal_chain": list[str],    # 因果連鎖の説明
         }
     """
+    return _stock_impact(stock_info, sensitivity, _scenario_params(scenario))
+
+
+def _stock_impact(
+    stock_info: dict,
+    sensitivity: dict,
+    params: _ScenarioParams,
+) -> dict:
+    """compute_stock_scenario_impact() の本体（シナリオ解釈済み）。"""
     symbol = stock_info.get("symbol", "")
     sector = stock_info.get("sector")
     currency = _infer_currency(symbol, stock_info)
@@ -179,8 +245,7 @@ def compute_stock_scenario_impact(
     beta = _safe_float(stock_info.get("beta"), default=1.0)
     etf_asset_class = _get_etf_asset_class(symbol, stock_info)
 
-    effects = scenario.get("effects", {})
-    base_shock = _safe_float(scenario.get("base_shock"))
+    base_shock = params.base_shock
     causal_chain: list[str] = []
 
     # 1. base_shock をbetaで調整（フォールバック用）
@@ -191,17 +256,13 @@ def compute_stock_scenario_impact(
 
     # 2. primary/secondary effects のマッチング
     matched_impacts: list[float] = []
-    for effect_group in ("primary", "secondary"):
-        for effect in effects.get(effect_group, []):
-            target = effect.get("target", "")
-            impact = _safe_float(effect.get("impact"))
-            reason = effect.get("reason", "")
-            if _match_target(target, sector, currency, region, etf_asset_class):
-                matched_impacts.append(impact)
-                sign = "+" if impact >= 0 else ""
-                causal_chain.append(
-                    f"[{effect_group}] {target}: {sign}{impact:.1%} ({reason})"
-                )
+    for effect_group, target, impact, reason in params.effect_rows:
+        if _match_target(target, sector, currency, region, etf_asset_class):
+            matched_impacts.append(impact)
+            sign = "+" if impact >= 0 else ""
+            causal_chain.append(
+                f"[{effect_group}] {target}: {sign}{impact:.1%} ({reason})"
+            )
 
     # マッチした影響がある場合はその平均を採用し、betaで微調整する
     # セクター影響は base_shock を既に内包しているため加算ではなく置換する
@@ -230,16 +291,13 @@ def compute_stock_scenario_impact(
         )
 
     # 4. 通貨効果
-    currency_data = effects.get("currency", {})
     currency_impact = 0.0
     if currency != "JPY":
         # 外貨建て資産への為替影響
-        impact_on_foreign = _safe_float(currency_data.get("impact_on_foreign"))
-        currency_impact = impact_on_foreign
-        usd_jpy_change = _safe_float(currency_data.get("usd_jpy_change"))
+        currency_impact = params.impact_on_foreign
         if currency_impact != 0.0:
             causal_chain.append(
-                f"通貨効果: USD/JPY {usd_jpy_change:+.0f}円 → 外貨資産 {currency_impact:+.1%}"
+                f"通貨効果: USD/JPY {params.usd_jpy_change:+.0f}円 → 外貨資産 {currency_impact:+.1%}"
             )
     elif currency == "JPY":
         # 円建て資産: 円安→マイナス方向の影響は既にprimary/secondaryで反映
@@ -264,6 +322,19 @@ def compute_stock_scenario_impact(
     }
 
 
+def _weighted_totals(stock_impacts: list[dict], weights: list[float]) -> tuple[float, float]:
+    """(Σ weight×total_impact, Σ weight×price_impact) を内積で求める。"""
+    m = len(stock_impacts)
+    weight_arr = np.fromiter(weights, dtype=np.float64, count=m)
+    total_arr = np.fromiter(
+        (imp["total_impact"] for imp in stock_impacts), dtype=np.float64, count=m
+    )
+    price_arr = np.fromiter(
+        (imp["price_impact"] for imp in stock_impacts), dtype=np.float64, count=m
+    )
+    return float(weight_arr @ total_arr), float(weight_arr @ price_arr)
+
+
 def analyze_portfolio_scenario(
     portfolio: list[dict],
     sensitivities: list[dict],
@@ -308,20 +379,31 @@ def analyze_portfolio_scenario(
         missing_count = n - len(weights)
         if missing_count > 0:
             weights = list(weights) + [remaining / missing_count] * missing_count
+    # numpy配列由来のウェイト（np.float64）がround()を経て結果dictに
+    # 残らないよう、Pythonのfloatに揃えておく（JSON化などで素直に扱える）
+    weights = [float(w) for w in weights]
 
     # 各銘柄のシナリオ影響を計算
+    # シナリオ定義の解釈は銘柄に依存しないのでループ外で1回だけ行う
+    params = _scenario_params(scenario)
     stock_impacts: list[dict] = []
-    portfolio_impact = 0.0
-    portfolio_value_change = 0.0
-
-    for i, (stock, sens, weight) in enumerate(zip(portfolio, sensitivities, weights)):
-        impact = compute_stock_scenario_impact(stock, sens, scenario)
+    for stock, sens, weight in zip(portfolio, sensitivities, weights):
+        impact = _stock_impact(stock, sens, params)
         impact["weight"] = round(weight, 4)
         impact["pf_contribution"] = round(impact["total_impact"] * weight, 4)
         stock_impacts.append(impact)
 
-        portfolio_impact += impact["total_impact"] * weight
-        portfolio_value_change += impact["price_impact"] * weight
+    # PF全体への寄与はウェイトとの内積でまとめて集計
+    # （1銘柄のみの場合は配列化のオーバーヘッドを避けて直接計算）
+    m = len(stock_impacts)
+    if m == 1:
+        only = stock_impacts[0]
+        portfolio_impact = only["total_impact"] * weights[0]
+        portfolio_value_change = only["price_impact"] * weights[0]
+    else:
+        portfolio_impact, portfolio_value_change = _weighted_totals(
+            stock_impacts, weights
+        )
 
     # 因果連鎖サマリを生成
     effects = scenario.get("effects", {})
@@ -7,12 +7,14 @@ Quantifies each stock's vulnerability to market shocks using a 4-layer model:
   Layer 4: Integrated shock = base_shock x L1 x L2 x L3
 """
 
+from functools import lru_cache
+from typing import Optional
+
 import numpy as np
 import pandas as pd
-from typing import Optional
 
 from src.core.common import safe_float as _safe_float
-from src.core.screening.technicals import compute_rsi
+from src.core.screening.technicals import _skipna_mean, compute_rsi
 
 
 # ---------------------------------------------------------------------------
@@ -20,36 +22,30 @@ from src.core.screening.technicals import compute_rsi
 # ---------------------------------------------------------------------------
 
 def _clamp(value: float, lo: float = 0.5, hi: float = 2.0) -> float:
-    """Clamp *value* to [lo, hi]."""
-    return max(lo, min(hi, value))
+    """Clamp *value* to [lo, hi] (NaN maps to *hi*, as max(lo, min(hi, x)) did)."""
+    # Plain comparisons avoid two builtin calls per score
+    if value < lo:
+        return lo
+    return value if value < hi else hi
 
 
 # ---------------------------------------------------------------------------
 # Layer 1: Fundamental sensitivity
 # ---------------------------------------------------------------------------
 
-def compute_fundamental_sensitivity(stock_info: dict) -> dict:
-    """Compute Layer-1 fundamental sensitivity score.
-
-    Parameters
-    ----------
-    stock_info : dict
-        Return value of ``yahoo_client.get_stock_info()``.  Uses the keys
-        ``per``, ``pbr``, ``dividend_yield``, ``market_cap``, and ``beta``.
-
-    Returns
-    -------
-    dict
-        ``score`` (0.5--2.0, 1.0 = neutral, higher = more vulnerable),
-        per_score, pbr_score, dividend_score, size_score, volatility_score,
-        and a human-readable ``detail`` string.
+@lru_cache(maxsize=4096)
+def _fundamental_scores(
+    per: float,
+    pbr: float,
+    dividend_yield: float,
+    market_cap: float,
+    beta: float,
+) -> tuple[float, float, float, float, float, float]:
+    """Return (score, per, pbr, dividend, size, volatility) sub-scores.
+
+    Inputs are already sanitised by ``_safe_float`` (never None/NaN), so
+    they are safe, hashable cache keys.
     """
-    per = _safe_float(stock_info.get("per"))
-    pbr = _safe_float(stock_info.get("pbr"))
-    dividend_yield = _safe_float(stock_info.get("dividend_yield"))
-    market_cap = _safe_float(stock_info.get("market_cap"))
-    beta = _safe_float(stock_info.get("beta"))
-
     # --- PER score ---
     if per <= 0:
         # Negative or zero PER (loss-making) -> treat as vulnerable
@@ -112,6 +108,49 @@ def compute_fundamental_sensitivity(stock_info: dict) -> dict:
     )
     score = _clamp(raw_score)
 
+    return (
+        score,
+        per_score,
+        pbr_score,
+        dividend_score,
+        size_score,
+        volatility_score,
+    )
+
+
+def compute_fundamental_sensitivity(stock_info: dict) -> dict:
+    """Compute Layer-1 fundamental sensitivity score.
+
+    Parameters
+    ----------
+    stock_info : dict
+        Return value of ``yahoo_client.get_stock_info()``.  Uses the keys
+        ``per``, ``pbr``, ``dividend_yield``, ``market_cap``, and ``beta``.
+
+    Returns
+    -------
+    dict
+        ``score`` (0.5--2.0, 1.0 = neutral, higher = more vulnerable),
+        per_score, pbr_score, dividend_score, size_score, volatility_score,
+        and a human-readable ``detail`` string.
+    """
+    per = _safe_float(stock_info.get("per"))
+    pbr = _safe_float(stock_info.get("pbr"))
+    dividend_yield = _safe_float(stock_info.get("dividend_yield"))
+    market_cap = _safe_float(stock_info.get("market_cap"))
+    beta = _safe_float(stock_info.get("beta"))
+
+    # Scores depend only on these five floats, so a stock re-scored across
+    # several scenarios hits the cache; the detail string is built per call.
+    (
+        score,
+        per_score,
+        pbr_score,
+        dividend_score,
+        size_score,
+        volatility_score,
+    ) = _fundamental_scores(per, pbr, dividend_yield, market_cap, beta)
+
     # Build human-readable detail
     details_parts = []
     if per_score >= 1.3:
@@ -184,13 +223,19 @@ def compute_technical_sensitivity(hist: pd.DataFrame, period: int = 14) -> dict:
     if len(close) < 50:
         return neutral
 
-    volume = hist["Volume"] if "Volume" in hist.columns else pd.Series(dtype=float)
-
-    current_price = float(close.iloc[-1])
+    # Work on plain ndarrays from here on (pandas per-call overhead dominates
+    # on ~250-row histories)
+    close_arr = close.to_numpy(dtype=np.float64)
+    if "Volume" in hist.columns:
+        volume_arr = hist["Volume"].to_numpy(dtype=np.float64)
+    else:
+        volume_arr = np.empty(0)
+    current_price = float(close_arr[-1])
 
     # --- RSI ---
     rsi_series = compute_rsi(close, period=period)
-    current_rsi = float(rsi_series.iloc[-1]) if len(rsi_series) >= 1 else float("nan")
+    rsi_arr = rsi_series.to_numpy(dtype=np.float64)
+    current_rsi = float(rsi_arr[-1]) if len(rsi_arr) >= 1 else float("nan")
 
     if np.isnan(current_rsi):
         rsi_score = 1.0
@@ -207,8 +252,9 @@ def compute_technical_sensitivity(hist: pd.DataFrame, period: int = 14) -> dict:
         rsi_score = 0.9
 
     # --- MA deviation: (price - SMA50) / SMA50 ---
-    sma50 = close.rolling(window=50).mean()
-    current_sma50 = float(sma50.iloc[-1])
+    # Only the latest SMA50 is needed, so average the trailing window directly
+    # (NaN inside the window propagates, as with rolling(50).mean())
+    current_sma50 = float(close_arr[-50:].mean())
     if current_sma50 > 0:
         ma_deviation = (current_price - current_sma50) / current_sma50
     else:
@@ -227,7 +273,7 @@ def compute_technical_sensitivity(hist: pd.DataFrame, period: int = 14) -> dict:
 
     # --- Surge: 30-day return ---
     if len(close) >= 30:
-        price_30d_ago = float(close.iloc[-30])
+        price_30d_ago = float(close_arr[-30])
         if price_30d_ago > 0:
             surge = (current_price - price_30d_ago) / price_30d_ago
         else:
@@ -245,9 +291,9 @@ def compute_technical_sensitivity(hist: pd.DataFrame, period: int = 14) -> dict:
         surge_score = 0.8
 
     # --- Volume heat: 5-day avg / 20-day avg ---
-    if len(volume) >= 20 and volume.sum() > 0:
-        vol_5 = float(volume.iloc[-5:].mean())
-        vol_20 = float(volume.iloc[-20:].mean())
+    if len(volume_arr) >= 20 and np.nansum(volume_arr) > 0:
+        vol_5 = _skipna_mean(volume_arr[-5:])
+        vol_20 = _skipna_mean(volume_arr[-20:])
         if vol_20 > 0:
             volume_heat = vol_5 / vol_20
         else:
@@ -305,6 +351,46 @@ def compute_technical_sensitivity(hist: pd.DataFrame, period: int = 14) -> dict:
 # Quadrant classification
 # ---------------------------------------------------------------------------
 
+_NEUTRAL_QUADRANT = {
+    "quadrant": "中立",
+    "emoji": "\u25cb",  # white circle
+    "description": "明確な象限に分類されない中間領域。",
+}
+
+# Indexed [fundamental bucket][technical bucket]; buckets are
+# 0 = sound/oversold, 1 = middle, 2 = vulnerable/overbought.
+_QUADRANT_TABLE: tuple[tuple[dict, ...], ...] = (
+    (
+        {
+            "quadrant": "耐性最強",
+            "emoji": "\u2705",  # check mark
+            "description": "ファンダ健全かつ売られ過ぎ水準。ショック耐性が最も高い。",
+        },
+        _NEUTRAL_QUADRANT,
+        {
+            "quadrant": "短期調整リスク",
+            "emoji": "\u26a0",  # warning sign
+            "description": "ファンダ健全だがテクニカル過熱。短期的な調整に注意。",
+        },
+    ),
+    # Middle zone: does not clearly fit any quadrant
+    (_NEUTRAL_QUADRANT, _NEUTRAL_QUADRANT, _NEUTRAL_QUADRANT),
+    (
+        {
+            "quadrant": "底抜けリスク",
+            "emoji": "\u26a0",  # warning sign
+            "description": "ファンダ脆弱かつ既に売り込まれている。更なる底抜けの懸念。",
+        },
+        _NEUTRAL_QUADRANT,
+        {
+            "quadrant": "最危険",
+            "emoji": "\U0001f534",  # red circle
+            "description": "ファンダ脆弱かつテクニカル過熱。ショック時に最も大きな下落リスク。",
+        },
+    ),
+)
+
+
 def classify_quadrant(fundamental_score: float, technical_score: float) -> dict:
     """Classify the stock into one of four vulnerability quadrants.
 
@@ -317,42 +403,11 @@ def classify_quadrant(fundamental_score: float, technical_score: float) -> dict:
     dict
         quadrant name, emoji, and description.
     """
-    f_vulnerable = fundamental_score > 1.2
-    t_overbought = technical_score > 1.2
-    t_oversold = technical_score < 0.9
-    f_sound = fundamental_score < 1.0
-
-    if f_vulnerable and t_overbought:
-        return {
-            "quadrant": "最危険",
-            "emoji": "\U0001f534",  # red circle
-            "description": "ファンダ脆弱かつテクニカル過熱。ショック時に最も大きな下落リスク。",
-        }
-    if f_vulnerable and t_oversold:
-        return {
-            "quadrant": "底抜けリスク",
-            "emoji": "\u26a0",  # warning sign
-            "description": "ファンダ脆弱かつ既に売り込まれている。更なる底抜けの懸念。",
-        }
-    if f_sound and t_overbought:
-        return {
-            "quadrant": "短期調整リスク",
-            "emoji": "\u26a0",  # warning sign
-            "description": "ファンダ健全だがテクニカル過熱。短期的な調整に注意。",
-        }
-    if f_sound and t_oversold:
-        return {
-            "quadrant": "耐性最強",
-            "emoji": "\u2705",  # check mark
-            "description": "ファンダ健全かつ売られ過ぎ水準。ショック耐性が最も高い。",
-        }
-
-    # Middle zone: does not clearly fit any quadrant
-    return {
-        "quadrant": "中立",
-        "emoji": "\u25cb",  # white circle
-        "description": "明確な象限に分類されない中間領域。",
-    }
+    # Bucket each axis as 1 +/- the comparisons (NaN stays in the middle)
+    f_bucket = 1 + (fundamental_score > 1.2) - (fundamental_score < 1.0)
+    t_bucket = 1 + (technical_score > 1.2) - (technical_score < 0.9)
+    # Copy so callers can't mutate the shared table entries
+    return dict(_QUADRANT_TABLE[f_bucket][t_bucket])
 
 
 # ---------------------------------------------------------------------------
@@ -386,7 +441,8 @@ def compute_integrated_shock(
     # Ensure scores are within bounds
     f = _clamp(fundamental_score)
     t = _clamp(technical_score)
-    c = max(concentration_multiplier, 0.5)  # floor at 0.5
+    # floor at 0.5 (comparison form of max(c, 0.5); NaN passes through as before)
+    c = 0.5 if concentration_multiplier < 0.5 else concentration_multiplier
 
     adjusted_shock = base_shock * f * t * c
 
@@ -142,27 +142,29 @@ class QueryScreener:
         (e.g. 'per', 'pbr') so that ``calculate_value_score`` and other
         downstream code works seamlessly.
         """
+        get = quote.get  # bound once; ~20 lookups per quote
+
         # dividendYield from yfinance is always a percentage (e.g. 3.5 for 3.5%)
-        raw_div = quote.get("dividendYield")
+        raw_div = get("dividendYield")
         if raw_div is not None:
             raw_div = raw_div / 100.0
 
         # returnOnEquity similarly may need normalisation
-        raw_roe = quote.get("returnOnEquity")
+        raw_roe = get("returnOnEquity")
         if raw_roe is not None and raw_roe > 1:
             raw_roe = raw_roe / 100.0
 
         # revenueGrowth / earningsGrowth may be percentages
-        raw_rev_growth = quote.get("revenueGrowth")
+        raw_rev_growth = get("revenueGrowth")
         if raw_rev_growth is not None and abs(raw_rev_growth) > 5:
             raw_rev_growth = raw_rev_growth / 100.0
 
         # --- Anomaly guard: sanitize extreme values ---
-        raw_per = quote.get("trailingPE")
+        raw_per = get("trailingPE")
         if raw_per is not None and 0 < raw_per < 1.0:
             raw_per = None
 
-        raw_pbr = quote.get("priceToBook")
+        raw_pbr = get("priceToBook")
         if raw_pbr is not None and raw_pbr < 0.05:
             raw_pbr = None
 
@@ -170,7 +172,7 @@ class QueryScreener:
             raw_div = None
 
         # Trailing dividend yield (actual, ratio form from yfinance)
-        raw_div_trailing = quote.get("trailingAnnualDividendYield")
+        raw_div_trailing = get("trailingAnnualDividendYield")
         if raw_div_trailing is not None and raw_div_trailing > 0.15:
             raw_div_trailing = None
 
@@ -178,17 +180,17 @@ class QueryScreener:
             raw_roe = None
 
         return {
-            "symbol": quote.get("symbol", ""),
-            "name": quote.get("shortName") or quote.get("longName"),
-            "sector": quote.get("sector"),
-            "industry": quote.get("industry"),
-            "currency": quote.get("currency"),
+            "symbol": get("symbol", ""),
+            "name": get("shortName") or get("longName"),
+            "sector": get("sector"),
+            "industry": get("industry"),
+            "currency": get("currency"),
             # Price
-            "price": quote.get("regularMarketPrice"),
-            "market_cap": quote.get("marketCap"),
+            "price": get("regularMarketPrice"),
+            "market_cap": get("marketCap"),
             # Valuation
             "per": raw_per,
-            "forward_per": quote.get("forwardPE"),
+            "forward_per": get("forwardPE"),
             "pbr": raw_pbr,
             # Profitability
             "roe": raw_roe,
@@ -197,9 +199,9 @@ class QueryScreener:
             "dividend_yield_trailing": raw_div_trailing,
             # Growth
             "revenue_growth": raw_rev_growth,
-            "earnings_growth": quote.get("earningsGrowth"),
+            "earnings_growth": get("earningsGrowth"),
             # Exchange info
-            "exchange": quote.get("exchange"),
+            "exchange": get("exchange"),
         }
 
     def screen(
@@ -2,33 +2,68 @@
 
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 
 def compute_rsi(close: pd.Series, period: int = 14) -> pd.Series:
     """RSI using Wilder's smoothing method (exponential moving average)."""
-    delta = close.diff()
-    gain = delta.where(delta > 0, 0.0)
-    loss = (-delta).where(delta < 0, 0.0)
-
-    # Wilder's smoothing: alpha = 1/period
+    prices = close.to_numpy(dtype=np.float64)
+    n = len(prices)
+    delta = np.diff(prices, prepend=np.nan)
+    # NaN deltas (first row, gaps) count as neither gain nor loss
+    gains = np.where(delta > 0, delta, 0.0).tolist()
+    losses = np.where(delta < 0, -delta, 0.0).tolist()
+
+    # Wilder's smoothing: alpha = 1/period.  One pass over plain floats, with
+    # the same update as ewm(alpha, adjust=False) so values are unchanged,
+    # avoids the per-call overhead of two pandas ewm() pipelines.
     alpha = 1.0 / period
-    avg_gain = gain.ewm(alpha=alpha, min_periods=period, adjust=False).mean()
-    avg_loss = loss.ewm(alpha=alpha, min_periods=period, adjust=False).mean()
-
-    rs = avg_gain / avg_loss
-    rsi = 100.0 - (100.0 / (1.0 + rs))
-    return rsi
+    decay = 1.0 - alpha
+    norm = decay + alpha
+    avg_gain = [0.0] * n
+    avg_loss = [0.0] * n
+    avg_g = gains[0] if n else 0.0
+    avg_l = losses[0] if n else 0.0
+    for i in range(n):
+        if i:
+            avg_g = (decay * avg_g + alpha * gains[i]) / norm
+            avg_l = (decay * avg_l + alpha * losses[i]) / norm
+        avg_gain[i] = avg_g
+        avg_loss[i] = avg_l
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = np.divide(avg_gain, avg_loss)
+        rsi = 100.0 - (100.0 / (1.0 + rs))
+    # min_periods=period: the first period-1 values are undefined
+    rsi[: period - 1] = np.nan
+    return pd.Series(rsi, index=close.index, name=close.name)
+
+
+def _skipna_mean(values: np.ndarray) -> float:
+    """Mean ignoring NaN (NaN when nothing is left), like Series.mean()."""
+    values = values[~np.isnan(values)]
+    return float(values.mean()) if values.size else float("nan")
 
 
 def compute_bollinger_bands(
     close: pd.Series, period: int = 20, std_dev: float = 2.0
 ) -> tuple[pd.Series, pd.Series, pd.Series]:
     """Return (upper, middle, lower) Bollinger Bands."""
-    middle = close.rolling(window=period).mean()
-    rolling_std = close.rolling(window=period).std()
-    upper = middle + std_dev * rolling_std
-    lower = middle - std_dev * rolling_std
-    return upper, middle, lower
+    prices = close.to_numpy(dtype=np.float64)
+    middle = np.full(len(prices), np.nan)
+    rolling_std = np.full(len(prices), np.nan)
+    if len(prices) >= period:
+        # One strided view serves both the mean and the std (sample, ddof=1),
+        # instead of two separate rolling() passes; NaN in a window -> NaN
+        windows = sliding_window_view(prices, period)
+        middle[period - 1:] = windows.mean(axis=1)
+        rolling_std[period - 1:] = windows.std(axis=1, ddof=1)
+    band = std_dev * rolling_std
+    return (
+        pd.Series(middle + band, index=close.index, name=close.name),
+        pd.Series(middle, index=close.index, name=close.name),
+        pd.Series(middle - band, index=close.index, name=close.name),
+    )
 
 
 def detect_pullback_in_uptrend(hist: pd.DataFrame) -> dict:
@@ -71,32 +106,34 @@ def detect_pullback_in_uptrend(hist: pd.DataFrame) -> dict:
     }
 
     close = hist["Close"]
-    volume = hist["Volume"]
 
     # 200-day MA needs ~200 data points
     if len(close) < 200:
         return default
 
-    # Moving averages
-    sma50 = close.rolling(window=50).mean()
-    sma200 = close.rolling(window=200).mean()
+    # Everything below reads only the latest few windows, so work on plain
+    # ndarrays instead of full-length rolling() Series
+    close_arr = close.to_numpy(dtype=np.float64)
+    volume_arr = hist["Volume"].to_numpy(dtype=np.float64)
 
-    current_price = float(close.iloc[-1])
-    current_sma50 = float(sma50.iloc[-1])
-    current_sma200 = float(sma200.iloc[-1])
+    # Moving averages (latest value only; NaN in the window propagates,
+    # as with rolling().mean())
+    current_price = float(close_arr[-1])
+    current_sma50 = float(close_arr[-50:].mean())
+    current_sma200 = float(close_arr[-200:].mean())
 
     # RSI
-    rsi_series = compute_rsi(close, period=14)
-    current_rsi = float(rsi_series.iloc[-1])
-    prev_rsi = float(rsi_series.iloc[-2]) if len(rsi_series) >= 2 else float("nan")
+    rsi_arr = compute_rsi(close, period=14).to_numpy()
+    current_rsi = float(rsi_arr[-1])
+    prev_rsi = float(rsi_arr[-2]) if len(rsi_arr) >= 2 else float("nan")
 
     # Volume ratio: 5-day avg / 20-day avg
-    vol_5 = volume.rolling(window=5).mean().iloc[-1]
-    vol_20 = volume.rolling(window=20).mean().iloc[-1]
+    vol_5 = volume_arr[-5:].mean()
+    vol_20 = volume_arr[-20:].mean()
     volume_ratio = float(vol_5 / vol_20) if vol_20 > 0 else float("nan")
 
-    # Recent 60-day high
-    recent_high = float(close.iloc[-60:].max())
+    # Recent 60-day high (fmax skips NaN like Series.max())
+    recent_high = float(np.fmax.reduce(close_arr[-60:]))
 
     # Pullback percentage from recent high
     pullback_pct = (current_price - recent_high) / recent_high if recent_high > 0 else 0.0
@@ -112,6 +149,7 @@ def detect_pullback_in_uptrend(hist: pd.DataFrame) -> dict:
 
     # --- Condition 3: Bounce signal (score-based with lookback) ---
     _, _, lower_band = compute_bollinger_bands(close, period=20, std_dev=2.0)
+    lower_arr = lower_band.to_numpy()
 
     lookback = 5  # Check last 5 trading days for bounce signals
     bounce_score = 0.0
@@ -124,21 +162,25 @@ def detect_pullback_in_uptrend(hist: pd.DataFrame) -> dict:
         "lookback_day": 0,
     }
 
+    n_close = len(close_arr)
+    n_rsi = len(rsi_arr)
+    n_volume = len(volume_arr)
     for offset in range(lookback):
         idx = -1 - offset
-        if abs(idx) >= len(close) or abs(idx) >= len(rsi_series):
+        if abs(idx) >= n_close or abs(idx) >= n_rsi:
             break
 
-        day_rsi = float(rsi_series.iloc[idx])
-        day_prev_rsi = float(rsi_series.iloc[idx - 1]) if abs(idx - 1) < len(rsi_series) else float("nan")
-        day_close = float(close.iloc[idx])
-        day_prev_close = float(close.iloc[idx - 1]) if abs(idx - 1) < len(close) else float("nan")
-        day_lower = float(lower_band.iloc[idx]) if abs(idx) < len(lower_band) and not np.isnan(lower_band.iloc[idx]) else float("nan")
-
-        # Volume ratio for this specific day
-        if abs(idx) < len(volume):
-            day_vol_5 = volume.iloc[max(0, len(volume) + idx - 4) : len(volume) + idx + 1].mean()
-            day_vol_20 = volume.iloc[max(0, len(volume) + idx - 19) : len(volume) + idx + 1].mean()
+        day_rsi = float(rsi_arr[idx])
+        day_prev_rsi = float(rsi_arr[idx - 1]) if abs(idx - 1) < n_rsi else float("nan")
+        day_close = float(close_arr[idx])
+        day_prev_close = float(close_arr[idx - 1]) if abs(idx - 1) < n_close else float("nan")
+        day_lower = float(lower_arr[idx]) if abs(idx) < len(lower_arr) else float("nan")
+
+        # Volume ratio for this specific day (NaN-skipping means)
+        if abs(idx) < n_volume:
+            end = n_volume + idx + 1
+            day_vol_5 = _skipna_mean(volume_arr[max(0, end - 5):end])
+            day_vol_20 = _skipna_mean(volume_arr[max(0, end - 20):end])
             day_volume_ratio = float(day_vol_5 / day_vol_20) if day_vol_20 > 0 else float("nan")
         else:
             day_volume_ratio = float("nan")
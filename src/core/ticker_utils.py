@@ -4,6 +4,8 @@ Merged from portfolio_manager.py and scenario_analysis.py to provide
 a single source of truth for suffix-based lookups.
 """
 
+from functools import lru_cache
+
 from src.core.common import is_cash
 
 
@@ -61,6 +63,18 @@ SUFFIX_TO_CURRENCY = {
 }
 
 
+def _suffix(symbol: str) -> str:
+    """Return the upper-cased ".XX" suffix of *symbol*, or "" if it has none.
+
+    Uses str.rpartition so no intermediate list is allocated; the result
+    can be looked up directly in SUFFIX_TO_REGION / SUFFIX_TO_CURRENCY.
+    """
+    head, dot, tail = symbol.rpartition(".")
+    if not dot:
+        return ""
+    return "." + tail.upper()
+
+
 def cash_currency(symbol: str) -> str:
     """Extract currency from cash symbol (e.g., 'JPY.CASH' -> 'JPY')."""
     return symbol.upper().replace(".CASH", "")
@@ -77,15 +91,16 @@ def infer_currency(symbol: str, info: dict | None = None) -> str:
         currency_from_info = info.get("currency")
         if currency_from_info:
             return currency_from_info
+    return _currency_from_symbol(symbol)
+
+
+@lru_cache(maxsize=1024)
+def _currency_from_symbol(symbol: str) -> str:
+    """Symbol-only part of infer_currency(), memoized per symbol."""
     if is_cash(symbol):
         return cash_currency(symbol)
-    for suffix, currency in SUFFIX_TO_CURRENCY.items():
-        if symbol.upper().endswith(suffix.upper()):
-            return currency
-    # No suffix typically means USD
-    if "." not in symbol:
-        return "USD"
-    return "USD"
+    # No suffix (US stock) or unknown suffix both default to USD
+    return SUFFIX_TO_CURRENCY.get(_suffix(symbol), "USD")
 
 
 def infer_country(symbol: str, info: dict | None = None) -> str:
@@ -110,10 +125,8 @@ def infer_country(symbol: str, info: dict | None = None) -> str:
         if cur == "JPY":
             return "Japan"
         return "Unknown"
-    for suffix, country in SUFFIX_TO_REGION.items():
-        if symbol.upper().endswith(suffix.upper()):
-            return country
+    suffix = _suffix(symbol)
     # No suffix typically means US stock
-    if "." not in symbol:
+    if not suffix:
         return "United States"
-    return "Unknown"
+    return SUFFIX_TO_REGION.get(suffix, "Unknown")
@@ -10,12 +10,15 @@ all search functions return empty results (graceful degradation).
 
 import json
 import os
+import re
 import sys
+import threading
 from pathlib import Path
 from typing import Optional
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 # Load .env from project root
 load_dotenv(Path(__file__).resolve().parents[2] / ".env")
@@ -23,11 +26,31 @@ load_dotenv(Path(__file__).resolve().parents[2] / ".env")
 
 _API_URL = "https://api.x.ai/v1/responses"
 _DEFAULT_MODEL = "grok-4-1-fast-non-reasoning"
+# Set after the first API error is reported; the lock keeps check-and-set
+# atomic when researcher calls search_* from worker threads
 _error_warned = [False]
+_error_warned_lock = threading.Lock()
+# CJK symbols/kana through unified ideographs (U+3000..U+9FFF)
+_JAPANESE_RE = re.compile("[\u3000-\u9fff]")
+_JSON_DECODER = json.JSONDecoder()
+
+# One pooled session for all Grok calls so the TCP/TLS connection to
+# api.x.ai is reused instead of re-established per request.  research_stock
+# issues two calls at once from its worker threads; sharing the Session
+# across them is accepted (stateless POSTs, no cookies or auth mutation) and
+# the pool holds one connection per concurrent caller.  No automatic retries:
+# POSTs are not idempotent and errors already degrade to "".
+_POOL_MAXSIZE = 2
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://", HTTPAdapter(pool_connections=1, pool_maxsize=_POOL_MAXSIZE)
+)
 
 # ---------------------------------------------------------------------------
 # Empty result constants
 # ---------------------------------------------------------------------------
+# Shared templates: search_* functions hand out fresh copies (_fresh_copy),
+# so callers can mutate the nested lists/dicts without touching these.
 
 EMPTY_STOCK_DEEP = {
     "recent_news": [],
@@ -75,6 +98,21 @@ EMPTY_BUSINESS = {
 }
 
 
+def _fresh_copy(template: dict) -> dict:
+    """Copy an EMPTY_* template with new nested dicts and lists.
+
+    The templates hold only empty lists, nested dicts and immutable leaves,
+    so this structural copy is equivalent to copy.deepcopy without its
+    memo/dispatch overhead.
+    """
+    return {
+        key: _fresh_copy(value) if isinstance(value, dict)
+        else list(value) if isinstance(value, list)
+        else value
+        for key, value in template.items()
+    }
+
+
 # ---------------------------------------------------------------------------
 # Public helpers
 # ---------------------------------------------------------------------------
@@ -100,7 +138,21 @@ def _is_japanese_stock(symbol: str) -> bool:
 
 def _contains_japanese(text: str) -> bool:
     """Return True if *text* contains Japanese characters."""
-    return any(0x3000 <= ord(c) <= 0x9FFF for c in text)
+    return _JAPANESE_RE.search(text) is not None
+
+
+def _post(url: str, **kwargs) -> requests.Response:
+    """POST via the shared pooled session (the patch target in tests)."""
+    return _SESSION.post(url, **kwargs)
+
+
+def _warn_once(message: str) -> None:
+    """Print *message* to stderr for the first API error only."""
+    with _error_warned_lock:
+        if _error_warned[0]:
+            return
+        _error_warned[0] = True
+    print(f"[grok_client] {message} (subsequent errors suppressed)", file=sys.stderr)
 
 
 def _call_grok_api(prompt: str, timeout: int = 30) -> str:
@@ -134,7 +186,7 @@ def _call_grok_api(prompt: str, timeout: int = 30) -> str:
             "input": prompt,
         }
 
-        response = requests.post(
+        response = _post(
             _API_URL,
             headers=headers,
             json=payload,
@@ -142,13 +194,7 @@ def _call_grok_api(prompt: str, timeout: int = 30) -> str:
         )
 
         if response.status_code != 200:
-            if not _error_warned[0]:
-                print(
-                    f"[grok_client] API error: "
-                    f"status={response.status_code} (subsequent errors suppressed)",
-                    file=sys.stderr,
-                )
-                _error_warned[0] = True
+            _warn_once(f"API error: status={response.status_code}")
             return ""
 
         data = response.json()
@@ -166,36 +212,45 @@ def _call_grok_api(prompt: str, timeout: int = 30) -> str:
         return raw_text
 
     except requests.exceptions.Timeout:
-        if not _error_warned[0]:
-            print("[grok_client] Timeout (subsequent errors suppressed)", file=sys.stderr)
-            _error_warned[0] = True
+        _warn_once("Timeout")
         return ""
     except requests.exceptions.RequestException as e:
-        if not _error_warned[0]:
-            print(f"[grok_client] Request error: {e} (subsequent errors suppressed)", file=sys.stderr)
-            _error_warned[0] = True
+        _warn_once(f"Request error: {e}")
         return ""
     except Exception as e:
-        if not _error_warned[0]:
-            print(f"[grok_client] Unexpected error: {e} (subsequent errors suppressed)", file=sys.stderr)
-            _error_warned[0] = True
+        _warn_once(f"Unexpected error: {e}")
         return ""
 
 
 def _parse_json_response(raw_text: str) -> dict:
     """Extract a JSON object from *raw_text*.
 
-    Finds the first ``{`` and last ``}`` and attempts ``json.loads``.
-    Returns an empty dict on failure.
+    Decodes in place from the first ``{`` and stops at the end of that
+    object, so trailing text (even with braces) is ignored.  Returns an
+    empty dict on failure.
     """
+    json_start = raw_text.find("{")
+    if json_start < 0:
+        return {}
     try:
-        json_start = raw_text.find("{")
-        json_end = raw_text.rfind("}") + 1
-        if json_start >= 0 and json_end > json_start:
-            return json.loads(raw_text[json_start:json_end])
-    except (json.JSONDecodeError, ValueError):
-        pass
-    return {}
+        obj, _ = _JSON_DECODER.raw_decode(raw_text, json_start)
+    except ValueError:
+        # Don't retry from later braces: that would surface a nested
+        # fragment of a truncated reply as if it were the whole answer
+        return {}
+    return obj
+
+
+def _take_fields(result: dict, parsed: dict, keys: tuple) -> None:
+    """Copy ``parsed[key]`` into *result* for each of *keys* whose value has
+    the same type as the template default already in *result*.
+
+    Mismatched or missing fields keep their defaults.
+    """
+    for key in keys:
+        value = parsed.get(key)
+        if isinstance(value, type(result[key])):
+            result[key] = value
 
 
 # ---------------------------------------------------------------------------
@@ -313,20 +368,23 @@ def _build_industry_prompt(industry_or_theme: str) -> str:
     )
 
 
+# region -> (label, exchange, ticker suffix); built once at import
+_REGION_DESC = {
+    "japan": ("日本株", "Tokyo Stock Exchange", ".T"),
+    "jp": ("日本株", "Tokyo Stock Exchange", ".T"),
+    "us": ("米国株", "US stock exchanges (NYSE/NASDAQ)", ""),
+    "asean": ("ASEAN株", "Singapore/Thailand/Malaysia/Indonesia/Philippines exchanges",
+              ".SI/.BK/.KL/.JK/.PS"),
+    "sg": ("シンガポール株", "Singapore Exchange", ".SI"),
+    "th": ("タイ株", "Stock Exchange of Thailand", ".BK"),
+    "hk": ("香港株", "Hong Kong Stock Exchange", ".HK"),
+    "kr": ("韓国株", "Korea Exchange", ".KS"),
+    "tw": ("台湾株", "Taiwan Stock Exchange", ".TW"),
+}
+
+
 def _build_trending_prompt(region: str = "japan", theme: Optional[str] = None) -> str:
     """Build the prompt for discovering trending stocks on X."""
-    _REGION_DESC = {
-        "japan": ("日本株", "Tokyo Stock Exchange", ".T"),
-        "jp": ("日本株", "Tokyo Stock Exchange", ".T"),
-        "us": ("米国株", "US stock exchanges (NYSE/NASDAQ)", ""),
-        "asean": ("ASEAN株", "Singapore/Thailand/Malaysia/Indonesia/Philippines exchanges",
-                  ".SI/.BK/.KL/.JK/.PS"),
-        "sg": ("シンガポール株", "Singapore Exchange", ".SI"),
-        "th": ("タイ株", "Stock Exchange of Thailand", ".BK"),
-        "hk": ("香港株", "Hong Kong Stock Exchange", ".HK"),
-        "kr": ("韓国株", "Korea Exchange", ".KS"),
-        "tw": ("台湾株", "Taiwan Stock Exchange", ".TW"),
-    }
     label, exchange, suffix = _REGION_DESC.get(region, _REGION_DESC["japan"])
 
     theme_part = f"\nFocus specifically on the theme/sector: {theme}" if theme else ""
@@ -523,17 +581,16 @@ def search_stock_deep(
     """
     raw_text = _call_grok_api(_build_stock_deep_prompt(symbol, company_name), timeout)
     if not raw_text:
-        return dict(EMPTY_STOCK_DEEP)
+        return _fresh_copy(EMPTY_STOCK_DEEP)
 
-    result = dict(EMPTY_STOCK_DEEP)
+    result = _fresh_copy(EMPTY_STOCK_DEEP)
     result["raw_response"] = raw_text
 
     parsed = _parse_json_response(raw_text)
     if not parsed:
         return result
 
-    if isinstance(parsed.get("recent_news"), list):
-        result["recent_news"] = parsed["recent_news"]
+    _take_fields(result, parsed, ("recent_news", "analyst_views", "competitive_notes"))
 
     catalysts = parsed.get("catalysts")
     if isinstance(catalysts, dict):
@@ -542,9 +599,6 @@ def search_stock_deep(
             "negative": catalysts.get("negative", []) if isinstance(catalysts.get("negative"), list) else [],
         }
 
-    if isinstance(parsed.get("analyst_views"), list):
-        result["analyst_views"] = parsed["analyst_views"]
-
     x_sent = parsed.get("x_sentiment")
     if isinstance(x_sent, dict):
         score = x_sent.get("score", 0.0)
@@ -554,9 +608,6 @@ def search_stock_deep(
             "key_opinions": x_sent.get("key_opinions", []) if isinstance(x_sent.get("key_opinions"), list) else [],
         }
 
-    if isinstance(parsed.get("competitive_notes"), list):
-        result["competitive_notes"] = parsed["competitive_notes"]
-
     return result
 
 
@@ -580,27 +631,19 @@ def search_industry(
     """
     raw_text = _call_grok_api(_build_industry_prompt(industry_or_theme), timeout)
     if not raw_text:
-        return dict(EMPTY_INDUSTRY)
+        return _fresh_copy(EMPTY_INDUSTRY)
 
-    result = dict(EMPTY_INDUSTRY)
+    result = _fresh_copy(EMPTY_INDUSTRY)
     result["raw_response"] = raw_text
 
     parsed = _parse_json_response(raw_text)
     if not parsed:
         return result
 
-    if isinstance(parsed.get("trends"), list):
-        result["trends"] = parsed["trends"]
-    if isinstance(parsed.get("key_players"), list):
-        result["key_players"] = parsed["key_players"]
-    if isinstance(parsed.get("growth_drivers"), list):
-        result["growth_drivers"] = parsed["growth_drivers"]
-    if isinstance(parsed.get("risks"), list):
-        result["risks"] = parsed["risks"]
-    if isinstance(parsed.get("regulatory"), list):
-        result["regulatory"] = parsed["regulatory"]
-    if isinstance(parsed.get("investor_focus"), list):
-        result["investor_focus"] = parsed["investor_focus"]
+    _take_fields(result, parsed, (
+        "trends", "key_players", "growth_drivers",
+        "risks", "regulatory", "investor_focus",
+    ))
 
     return result
 
@@ -625,19 +668,18 @@ def search_market(
     """
     raw_text = _call_grok_api(_build_market_prompt(market_or_index), timeout)
     if not raw_text:
-        return dict(EMPTY_MARKET)
+        return _fresh_copy(EMPTY_MARKET)
 
-    result = dict(EMPTY_MARKET)
+    result = _fresh_copy(EMPTY_MARKET)
     result["raw_response"] = raw_text
 
     parsed = _parse_json_response(raw_text)
     if not parsed:
         return result
 
-    if isinstance(parsed.get("price_action"), str):
-        result["price_action"] = parsed["price_action"]
-    if isinstance(parsed.get("macro_factors"), list):
-        result["macro_factors"] = parsed["macro_factors"]
+    _take_fields(result, parsed, (
+        "price_action", "macro_factors", "upcoming_events", "sector_rotation",
+    ))
 
     sentiment = parsed.get("sentiment")
     if isinstance(sentiment, dict):
@@ -647,11 +689,6 @@ def search_market(
             "summary": sentiment.get("summary", "") if isinstance(sentiment.get("summary"), str) else "",
         }
 
-    if isinstance(parsed.get("upcoming_events"), list):
-        result["upcoming_events"] = parsed["upcoming_events"]
-    if isinstance(parsed.get("sector_rotation"), list):
-        result["sector_rotation"] = parsed["sector_rotation"]
-
     return result
 
 
@@ -679,9 +716,9 @@ def search_trending_stocks(
     """
     raw_text = _call_grok_api(_build_trending_prompt(region, theme), timeout)
     if not raw_text:
-        return dict(EMPTY_TRENDING)
+        return _fresh_copy(EMPTY_TRENDING)
 
-    result = dict(EMPTY_TRENDING)
+    result = _fresh_copy(EMPTY_TRENDING)
     result["raw_response"] = raw_text
 
     parsed = _parse_json_response(raw_text)
@@ -700,8 +737,7 @@ def search_trending_stocks(
                 })
         result["stocks"] = validated
 
-    if isinstance(parsed.get("market_context"), str):
-        result["market_context"] = parsed["market_context"]
+    _take_fields(result, parsed, ("market_context",))
 
     return result
 
@@ -729,17 +765,19 @@ def search_business(
     """
     raw_text = _call_grok_api(_build_business_prompt(symbol, company_name), timeout)
     if not raw_text:
-        return dict(EMPTY_BUSINESS)
+        return _fresh_copy(EMPTY_BUSINESS)
 
-    result = dict(EMPTY_BUSINESS)
+    result = _fresh_copy(EMPTY_BUSINESS)
     result["raw_response"] = raw_text
 
     parsed = _parse_json_response(raw_text)
     if not parsed:
         return result
 
-    if isinstance(parsed.get("overview"), str):
-        result["overview"] = parsed["overview"]
+    _take_fields(result, parsed, (
+        "overview", "revenue_model", "competitive_advantages",
+        "key_metrics", "growth_strategy", "risks",
+    ))
 
     segments = parsed.get("segments")
     if isinstance(segments, list):
@@ -753,15 +791,4 @@ def search_business(
                 })
         result["segments"] = validated
 
-    if isinstance(parsed.get("revenue_model"), str):
-        result["revenue_model"] = parsed["revenue_model"]
-    if isinstance(parsed.get("competitive_advantages"), list):
-        result["competitive_advantages"] = parsed["competitive_advantages"]
-    if isinstance(parsed.get("key_metrics"), list):
-        result["key_metrics"] = parsed["key_metrics"]
-    if isinstance(parsed.get("growth_strategy"), list):
-        result["growth_strategy"] = parsed["growth_strategy"]
-    if isinstance(parsed.get("risks"), list):
-        result["risks"] = parsed["risks"]
-
     return result
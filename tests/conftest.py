@@ -35,12 +35,13 @@ def stock_detail_data() -> dict:
         return json.load(f)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def price_history_df() -> pd.DataFrame:
     """Load the price_history.csv fixture as a pandas DataFrame.
 
     Returns a DataFrame with columns: Open, High, Low, Close, Volume.
     250 rows representing an uptrend with a pullback pattern.
+    Parsed once per session and shared, so treat it as read-only.
     """
     path = FIXTURES_DIR / "price_history.csv"
     df = pd.read_csv(path)
@@ -1,6 +1,8 @@
 """Tests for src.core.portfolio.portfolio_manager module."""
 
 import os
+import time
+from types import SimpleNamespace
 
 import pytest
 
@@ -14,6 +16,7 @@ from src.core.portfolio.portfolio_manager import (
     _infer_currency,
     _is_cash,
     _cash_currency,
+    _weighted_average_cost,
 )
 
 
@@ -96,6 +99,32 @@ class TestLoadPortfolio:
         assert len(loaded) == 1
         assert loaded[0]["account"] == "特定"
 
+    def test_load_reordered_columns(self, csv_path):
+        """Columns are matched by header name, not position."""
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            f.write("memo,symbol,account,shares,cost_price,cost_currency,purchase_date\n")
+            f.write("Apple,AAPL,NISA,10,175.5,USD,2025-02-01\n")
+
+        loaded = load_portfolio(csv_path)
+        assert loaded == [{
+            "symbol": "AAPL", "shares": 10, "cost_price": 175.5,
+            "cost_currency": "USD", "account": "NISA",
+            "purchase_date": "2025-02-01", "memo": "Apple",
+        }]
+
+    def test_short_row_and_blank_line(self, csv_path):
+        """Trailing cells may be omitted; blank lines are skipped."""
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            f.write(",".join(CSV_COLUMNS) + "\n")
+            f.write("\n")
+            f.write("7203.T,100,2850.0\n")
+
+        loaded = load_portfolio(csv_path)
+        assert len(loaded) == 1
+        assert loaded[0]["cost_currency"] == "JPY"
+        assert loaded[0]["account"] == "特定"
+        assert loaded[0]["memo"] == ""
+
     def test_load_second_position(self, csv_path, sample_portfolio):
         """Verify the second position is also loaded correctly."""
         save_portfolio(sample_portfolio, csv_path)
@@ -130,6 +159,40 @@ class TestLoadPortfolio:
         assert len(loaded) == 0
 
 
+class TestLoadPortfolioCache:
+    def test_unchanged_file_is_not_reparsed(self, csv_path, sample_portfolio, monkeypatch):
+        import src.core.portfolio.portfolio_manager as pm
+
+        save_portfolio(sample_portfolio, csv_path)
+        first = load_portfolio(csv_path)
+
+        def _fail(path):
+            raise AssertionError("CSV should not be re-parsed")
+
+        monkeypatch.setattr(pm, "_read_portfolio_csv", _fail)
+        assert load_portfolio(csv_path) == first
+
+    def test_returned_rows_are_copies(self, csv_path, sample_portfolio):
+        save_portfolio(sample_portfolio, csv_path)
+        first = load_portfolio(csv_path)
+        first[0]["shares"] = 999
+        first.pop()
+
+        second = load_portfolio(csv_path)
+        assert len(second) == 2
+        assert second[0]["shares"] == 100
+
+    def test_external_rewrite_is_reloaded(self, csv_path, sample_portfolio):
+        save_portfolio(sample_portfolio, csv_path)
+        load_portfolio(csv_path)
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            f.write("symbol,shares,cost_price\n")
+            f.write("MSFT,3,400.0\n")
+
+        loaded = load_portfolio(csv_path)
+        assert [p["symbol"] for p in loaded] == ["MSFT"]
+
+
 # ===================================================================
 # save_portfolio
 # ===================================================================
@@ -263,13 +326,19 @@ class TestAddPosition:
         assert ("5020.T", "特定") in accounts
         assert ("5020.T", "NISA") in accounts
 
-    def test_default_purchase_date(self, csv_path):
+    def test_default_purchase_date(self, csv_path, monkeypatch):
         """If purchase_date is None, it should default to today's date."""
+        import src.core.portfolio.portfolio_manager as pm
+        monkeypatch.setattr(pm, "_today_iso", lambda: "2025-03-07")
         result = add_position(csv_path, "7203.T", 100, 2800.0, "JPY")
-        assert result["purchase_date"] != ""
-        # Should be in YYYY-MM-DD format
-        parts = result["purchase_date"].split("-")
-        assert len(parts) == 3
+        assert result["purchase_date"] == "2025-03-07"
+
+    def test_today_iso_is_zero_padded_local_date(self, monkeypatch):
+        """_today_iso formats the frozen local date as YYYY-MM-DD."""
+        import src.core.portfolio.portfolio_manager as pm
+        frozen = time.struct_time((2025, 3, 7, 23, 59, 59, 4, 66, 0))
+        monkeypatch.setattr(pm, "time", SimpleNamespace(localtime=lambda: frozen))
+        assert pm._today_iso() == "2025-03-07"
 
     def test_us_symbol_uppercased(self, csv_path):
         """US symbols (no dot) should be uppercased."""
@@ -282,6 +351,49 @@ class TestAddPosition:
         assert result["symbol"] == "7203.T"
 
 
+class TestSingleCsvRead:
+    """add/sell should parse the CSV once and return the in-memory row."""
+
+    @pytest.fixture
+    def load_calls(self, monkeypatch):
+        import src.core.portfolio.portfolio_manager as pm
+
+        calls = []
+        original = pm.load_portfolio
+
+        def _counting_load(path):
+            calls.append(path)
+            return original(path)
+
+        monkeypatch.setattr(pm, "load_portfolio", _counting_load)
+        return calls
+
+    def test_add_position_reads_once(self, csv_path, load_calls):
+        add_position(csv_path, "7203.T", 100, 2800.0, "JPY", "2025-01-01")
+        assert len(load_calls) == 1
+
+    def test_sell_position_reads_once(self, csv_path, load_calls):
+        add_position(csv_path, "7203.T", 100, 2800.0, "JPY", "2025-01-01")
+        load_calls.clear()
+        result = sell_position(csv_path, "7203.T", 30)
+        assert result["shares"] == 70
+        assert len(load_calls) == 1
+
+
+# ===================================================================
+# _weighted_average_cost
+# ===================================================================
+
+
+class TestWeightedAverageCost:
+    def test_average(self):
+        assert _weighted_average_cost(100, 2800.0, 50, 3100.0) == pytest.approx(2900.0)
+
+    def test_overflow_gives_inf(self):
+        """Huge products overflow to inf instead of raising."""
+        assert _weighted_average_cost(1e200, 1e200, 1.0, 1.0) == float("inf")
+
+
 # ===================================================================
 # sell_position
 # ===================================================================
@@ -419,6 +531,13 @@ class TestInferCurrency:
     def test_unknown_suffix_defaults_usd(self):
         assert _infer_currency("UNKNOWN.XX") == "USD"
 
+    def test_lowercase_suffix(self):
+        assert _infer_currency("7203.t") == "JPY"
+
+    def test_longest_suffix_not_shadowed(self):
+        assert _infer_currency("6488.TWO") == "TWD"
+        assert _infer_currency("RY.TO") == "CAD"
+
     def test_cash_jpy(self):
         assert _infer_currency("JPY.CASH") == "JPY"
 
@@ -113,39 +113,31 @@ class TestBuildSectorCondition:
 
 
 class TestBuildCriteriaConditions:
-    def test_max_per(self):
-        """max_per should produce a 'lt' condition on peratio field."""
-        conditions = _build_criteria_conditions({"max_per": 15})
-        assert len(conditions) == 1
-        assert isinstance(conditions[0], EquityQuery)
-
-    def test_multiple_criteria(self):
-        """Multiple criteria should produce one condition each."""
-        criteria = {
-            "max_per": 15,
-            "max_pbr": 1.5,
-            "min_dividend_yield": 0.02,
-            "min_roe": 0.08,
-            "min_revenue_growth": 0.05,
-        }
+    @pytest.mark.parametrize(
+        "criteria,expected_len",
+        [
+            pytest.param({"max_per": 15}, 1, id="max_per"),
+            pytest.param(
+                {
+                    "max_per": 15,
+                    "max_pbr": 1.5,
+                    "min_dividend_yield": 0.02,
+                    "min_roe": 0.08,
+                    "min_revenue_growth": 0.05,
+                },
+                5,
+                id="multiple",
+            ),
+            pytest.param({"unknown_key": 42}, 0, id="unknown_ignored"),
+            pytest.param({}, 0, id="empty"),
+            pytest.param({"max_per": 15, "some_custom_field": 99}, 1, id="mixed"),
+        ],
+    )
+    def test_one_condition_per_known_key(self, criteria, expected_len):
+        """Each known criteria key yields one EquityQuery; unknown keys are skipped."""
         conditions = _build_criteria_conditions(criteria)
-        assert len(conditions) == 5
-
-    def test_unknown_criteria_ignored(self):
-        """Unknown criteria keys should be silently skipped."""
-        conditions = _build_criteria_conditions({"unknown_key": 42})
-        assert len(conditions) == 0
-
-    def test_empty_criteria(self):
-        """Empty criteria dict should produce empty list."""
-        conditions = _build_criteria_conditions({})
-        assert len(conditions) == 0
-
-    def test_mixed_known_and_unknown(self):
-        """Mix of known and unknown keys: only known ones produce conditions."""
-        criteria = {"max_per": 15, "some_custom_field": 99}
-        conditions = _build_criteria_conditions(criteria)
-        assert len(conditions) == 1
+        assert len(conditions) == expected_len
+        assert all(isinstance(c, EquityQuery) for c in conditions)
 
 
 # ===================================================================
@@ -153,74 +145,67 @@ class TestBuildCriteriaConditions:
 # ===================================================================
 
 
-class TestBuildQuery:
-    def test_region_jp_produces_query(self):
-        """build_query with region='jp' should produce a valid EquityQuery."""
-        query = build_query({}, region="jp")
-        assert isinstance(query, EquityQuery)
+# (criteria, region, exchange, sector, ...)
+# Several conditions -> AND of n_conditions operands
+_AND_QUERY_CASES = [
+    pytest.param({}, "jp", None, "Technology", 2, id="region_sector"),
+    pytest.param({"max_per": 15, "min_roe": 0.08}, "jp", None, None, 3, id="region_criteria"),
+    pytest.param({}, "jp", "JPX", None, 2, id="region_exchange"),
+    pytest.param(
+        {"max_per": 20, "min_dividend_yield": 0.02}, "jp", "JPX", "Technology", 5,
+        id="all_combined",
+    ),
+]
+
+# A single condition -> that leaf query, not wrapped in AND
+_SINGLE_QUERY_CASES = [
+    pytest.param({}, "jp", None, None, ("EQ", ["region", "jp"]), id="region_jp"),
+    pytest.param({}, "japan", None, None, ("EQ", ["region", "jp"]), id="region_japan"),
+    pytest.param({}, "us", None, None, ("EQ", ["region", "us"]), id="region_us_empty_criteria"),
+    pytest.param({}, None, None, "Healthcare", ("EQ", ["sector", "Healthcare"]), id="only_sector"),
+    pytest.param({}, None, "JPX", None, ("EQ", ["exchange", "JPX"]), id="only_exchange"),
+    pytest.param(
+        {"max_per": 15}, None, None, None, ("LT", ["peratio.lasttwelvemonths", 15]),
+        id="only_criteria",
+    ),
+]
+
+# Inputs that yield no conditions at all
+_NO_CONDITION_CASES = [
+    pytest.param({}, {}, id="no_args"),
+    pytest.param({}, {"region": None, "exchange": None, "sector": None}, id="explicit_none"),
+]
 
-    def test_region_japan_produces_query(self):
-        """build_query with region='japan' should produce a valid EquityQuery."""
-        query = build_query({}, region="japan")
-        assert isinstance(query, EquityQuery)
 
-    def test_sector_included(self):
-        """Sector specification should be included in the query."""
-        query = build_query({}, region="jp", sector="Technology")
-        assert isinstance(query, EquityQuery)
-
-    def test_criteria_reflected(self):
-        """Criteria conditions should be part of the built query."""
-        criteria = {"max_per": 15, "min_roe": 0.08}
-        query = build_query(criteria, region="jp")
+class TestBuildQuery:
+    @pytest.mark.parametrize(
+        "criteria,region,exchange,sector,n_conditions", _AND_QUERY_CASES
+    )
+    def test_multiple_conditions_are_and_combined(
+        self, criteria, region, exchange, sector, n_conditions
+    ):
+        """Multiple conditions are AND-combined."""
+        query = build_query(criteria, region=region, exchange=exchange, sector=sector)
         assert isinstance(query, EquityQuery)
 
-    def test_exchange_included(self):
-        """Exchange specification should be included."""
-        query = build_query({}, region="jp", exchange="JPX")
-        assert isinstance(query, EquityQuery)
+        q = query.to_dict()
+        assert q["operator"] == "AND"
+        assert len(q["operands"]) == n_conditions
 
-    def test_all_options_combined(self):
-        """Region + exchange + sector + criteria all combined."""
-        criteria = {"max_per": 20, "min_dividend_yield": 0.02}
-        query = build_query(criteria, region="jp", exchange="JPX", sector="Technology")
+    @pytest.mark.parametrize("criteria,region,exchange,sector,leaf", _SINGLE_QUERY_CASES)
+    def test_single_condition_returned_as_leaf(self, criteria, region, exchange, sector, leaf):
+        """A single condition is returned directly (not nested in AND)."""
+        query = build_query(criteria, region=region, exchange=exchange, sector=sector)
         assert isinstance(query, EquityQuery)
 
-    def test_empty_criteria_with_region_ok(self):
-        """Empty criteria + region should still produce a valid query (region only)."""
-        query = build_query({}, region="us")
-        assert isinstance(query, EquityQuery)
+        operator, operands = leaf
+        assert query.to_dict() == {"operator": operator, "operands": operands}
 
-    def test_no_conditions_raises_value_error(self):
+    @pytest.mark.parametrize("criteria,kwargs", _NO_CONDITION_CASES)
+    def test_no_conditions_raises_value_error(self, criteria, kwargs):
         """No criteria, no region, no exchange, no sector -> ValueError."""
         with pytest.raises(ValueError, match="No query conditions"):
-            build_query({})
-
-    def test_empty_criteria_no_region_raises_value_error(self):
-        """Empty criteria and no optional args -> ValueError."""
-        with pytest.raises(ValueError):
-            build_query({}, region=None, exchange=None, sector=None)
-
-    def test_only_sector_produces_query(self):
-        """Sector alone (no region/exchange/criteria) should produce a valid query."""
-        query = build_query({}, sector="Healthcare")
-        assert isinstance(query, EquityQuery)
-
-    def test_only_exchange_produces_query(self):
-        """Exchange alone should produce a valid query."""
-        query = build_query({}, exchange="JPX")
-        assert isinstance(query, EquityQuery)
-
-    def test_only_criteria_produces_query(self):
-        """Criteria alone (no region/exchange/sector) should produce a valid query."""
-        query = build_query({"max_per": 15})
-        assert isinstance(query, EquityQuery)
-
-    def test_single_condition_not_wrapped_in_and(self):
-        """A single condition should be returned directly (not nested in AND)."""
-        query = build_query({}, region="jp")
-        # The result should be a single EquityQuery, not AND-wrapped
-        assert isinstance(query, EquityQuery)
+            build_query(criteria, **kwargs)
 
 
 # ===================================================================
@@ -228,28 +213,29 @@ class TestBuildQuery:
 # ===================================================================
 
 
-class TestConstants:
-    def test_region_map_completeness(self):
-        """REGION_MAP should have entries for all expected markets."""
-        expected = {"japan", "us", "singapore", "thailand", "malaysia", "indonesia", "philippines"}
-        assert set(REGION_MAP.keys()) == expected
-
-    def test_exchange_map_completeness(self):
-        """EXCHANGE_MAP should have entries for all expected markets."""
-        expected = {"japan", "us", "singapore", "thailand", "malaysia", "indonesia", "philippines"}
-        assert set(EXCHANGE_MAP.keys()) == expected
+_EXPECTED_MARKETS = frozenset(
+    {"japan", "us", "singapore", "thailand", "malaysia", "indonesia", "philippines"}
+)
+_EXPECTED_ASEAN_REGIONS = frozenset({"sg", "th", "my", "id", "ph"})
+_EXPECTED_ASEAN_EXCHANGES = frozenset({"SES", "SET", "KLS", "JKT", "PHS"})
+_EXPECTED_CRITERIA = frozenset({
+    "max_per", "max_pbr", "min_dividend_yield", "min_roe",
+    "min_revenue_growth", "min_earnings_growth", "min_market_cap",
+})
 
-    def test_asean_regions(self):
-        """ASEAN_REGIONS should contain 5 country codes."""
-        assert len(ASEAN_REGIONS) == 5
-        assert set(ASEAN_REGIONS) == {"sg", "th", "my", "id", "ph"}
 
-    def test_asean_exchanges(self):
-        """ASEAN_EXCHANGES should contain 5 exchange codes."""
-        assert len(ASEAN_EXCHANGES) == 5
-        assert set(ASEAN_EXCHANGES) == {"SES", "SET", "KLS", "JKT", "PHS"}
-
-    def test_criteria_field_map_keys(self):
-        """_CRITERIA_FIELD_MAP should have the expected keys."""
-        expected = {"max_per", "max_pbr", "min_dividend_yield", "min_roe", "min_revenue_growth", "min_earnings_growth", "min_market_cap"}
-        assert set(_CRITERIA_FIELD_MAP.keys()) == expected
+class TestConstants:
+    @pytest.mark.parametrize(
+        "actual,expected",
+        [
+            pytest.param(list(REGION_MAP), _EXPECTED_MARKETS, id="region_map"),
+            pytest.param(list(EXCHANGE_MAP), _EXPECTED_MARKETS, id="exchange_map"),
+            pytest.param(ASEAN_REGIONS, _EXPECTED_ASEAN_REGIONS, id="asean_regions"),
+            pytest.param(ASEAN_EXCHANGES, _EXPECTED_ASEAN_EXCHANGES, id="asean_exchanges"),
+            pytest.param(list(_CRITERIA_FIELD_MAP), _EXPECTED_CRITERIA, id="criteria_field_map"),
+        ],
+    )
+    def test_keys_complete(self, actual, expected):
+        """Each mapping/list has exactly the expected entries, without duplicates."""
+        assert len(actual) == len(expected)
+        assert frozenset(actual) == expected
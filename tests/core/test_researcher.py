@@ -4,13 +4,12 @@ Tests for research_stock, research_industry, research_market.
 All external calls (yahoo_client, grok_client) are mocked.
 """
 
-import sys
-from pathlib import Path
+import threading
+from types import MappingProxyType, SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
-
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+import requests
 
 from src.core.research.researcher import (
     research_stock,
@@ -18,7 +17,13 @@ from src.core.research.researcher import (
     research_market,
     research_business,
     _grok_warned,
+    _safe_grok_call,
+    _empty_industry,
+    _empty_market,
+    _empty_sentiment,
+    _empty_stock_deep,
 )
+from src.data import grok_client
 
 
 # ---------------------------------------------------------------------------
@@ -32,54 +37,142 @@ def _reset_grok_warned():
     yield
 
 
+@pytest.fixture(autouse=True)
+def _clear_xai_key(monkeypatch):
+    """Run every test with Grok off unless it opts in via grok_enabled."""
+    monkeypatch.delenv("XAI_API_KEY", raising=False)
+
+
+@pytest.fixture
+def grok_enabled(monkeypatch):
+    """Set XAI_API_KEY and force grok_client.is_available() to True.
+
+    Returns the same monkeypatch so tests can stub the search_* calls.
+    """
+    monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
+    monkeypatch.setattr(grok_client, "is_available", lambda: True)
+    return monkeypatch
+
+
+def _raise_api_down(*_a, **_k):
+    """Stand-in for a grok_client.search_* call whose API is down."""
+    raise RuntimeError("API down")
+
+
 def _make_mock_yahoo_client(info=None, news=None):
-    """Build a mock yahoo_client module with get_stock_info / get_stock_news."""
-    mock = MagicMock()
-    mock.get_stock_info.return_value = info
-    mock.get_stock_news.return_value = news or []
-    return mock
-
-
-def _sample_stock_info():
-    """Minimal stock info matching the stock_info.json fixture."""
-    return {
-        "symbol": "7203.T",
-        "name": "Toyota Motor Corporation",
-        "sector": "Consumer Cyclical",
-        "industry": "Auto Manufacturers",
-        "price": 2850.0,
-        "market_cap": 42_000_000_000_000,
-        "per": 10.5,
-        "pbr": 1.1,
-        "roe": 0.12,
-        "dividend_yield": 0.028,
-        "revenue_growth": 0.15,
-        "eps_growth": 0.10,
-        "beta": 0.65,
-        "debt_to_equity": 105.0,
-    }
-
-
-def _sample_deep_result():
-    """Sample deep research result from grok_client."""
-    return {
+    """Build a stub yahoo_client module with get_stock_info / get_stock_news."""
+    news = news or []
+    return SimpleNamespace(
+        get_stock_info=lambda *_a, **_k: info,
+        get_stock_news=lambda *_a, **_k: news,
+    )
+
+
+# Minimal stock info matching the stock_info.json fixture (read-only)
+_SAMPLE_STOCK_INFO = MappingProxyType({
+    "symbol": "7203.T",
+    "name": "Toyota Motor Corporation",
+    "sector": "Consumer Cyclical",
+    "industry": "Auto Manufacturers",
+    "price": 2850.0,
+    "market_cap": 42_000_000_000_000,
+    "per": 10.5,
+    "pbr": 1.1,
+    "roe": 0.12,
+    "dividend_yield": 0.028,
+    "revenue_growth": 0.15,
+    "eps_growth": 0.10,
+    "beta": 0.65,
+    "debt_to_equity": 105.0,
+})
+
+# Shared stub for tests that need the sample info and no news
+_YC_DEFAULT = _make_mock_yahoo_client(info=_SAMPLE_STOCK_INFO)
+
+
+@pytest.fixture(scope="session")
+def sample_stock_info():
+    """Minimal stock info matching the stock_info.json fixture (read-only)."""
+    return _SAMPLE_STOCK_INFO
+
+
+@pytest.fixture(scope="session")
+def sample_deep_result():
+    """Sample deep research result from grok_client (read-only)."""
+    return MappingProxyType({
         "recent_news": ["Strong Q3 earnings"],
         "catalysts": {"positive": ["EV push"], "negative": ["Chip shortage"]},
         "analyst_views": ["Buy rating"],
         "x_sentiment": {"score": 0.5, "summary": "Positive", "key_opinions": []},
         "competitive_notes": ["Market leader"],
         "raw_response": '{"recent_news": ["Strong Q3 earnings"]}',
-    }
+    })
 
 
-def _sample_sentiment():
-    """Sample X sentiment result from grok_client."""
-    return {
+@pytest.fixture(scope="session")
+def sample_sentiment():
+    """Sample X sentiment result from grok_client (read-only)."""
+    return MappingProxyType({
         "positive": ["Good earnings"],
         "negative": ["Yen weakness"],
         "sentiment_score": 0.3,
         "raw_response": "...",
-    }
+    })
+
+
+_INDUSTRY_DATA = {
+    "trends": ["AI chip demand"],
+    "key_players": [{"name": "TSMC", "ticker": "TSM", "note": "Leader"}],
+    "growth_drivers": ["Data center"],
+    "risks": ["Geopolitics"],
+    "regulatory": ["Export controls"],
+    "investor_focus": ["CAPEX"],
+    "raw_response": "...",
+}
+
+_MARKET_DATA = {
+    "price_action": "Nikkei up 1.5%",
+    "macro_factors": ["BOJ decision"],
+    "sentiment": {"score": 0.4, "summary": "Optimistic"},
+    "upcoming_events": ["GDP Friday"],
+    "sector_rotation": ["Defensive to cyclical"],
+    "raw_response": "...",
+}
+
+
+# ===================================================================
+# _safe_grok_call
+# ===================================================================
+
+class TestSafeGrokCall:
+    def test_returns_result_on_success(self):
+        assert _safe_grok_call(lambda x: x * 2, 21) == 42
+
+    def test_warns_only_once(self, capsys):
+        """First failure prints a warning; later failures are silent."""
+        assert _safe_grok_call(_raise_api_down) is None
+        assert _safe_grok_call(_raise_api_down) is None
+        err = capsys.readouterr().err
+        assert err.count("Grok API error") == 1
+        assert _grok_warned[0] is True
+
+    def test_warns_only_once_across_threads(self, capsys):
+        """Simultaneous failures in worker threads still warn exactly once."""
+        barrier = threading.Barrier(8, timeout=5)
+
+        def fail():
+            barrier.wait()
+            _raise_api_down()
+
+        threads = [
+            threading.Thread(target=_safe_grok_call, args=(fail,)) for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert capsys.readouterr().err.count("Grok API error") == 1
 
 
 # ===================================================================
@@ -88,12 +181,10 @@ def _sample_sentiment():
 
 class TestResearchStock:
 
-    def test_basic_research(self, monkeypatch):
+    def test_basic_research(self, sample_stock_info):
         """Returns fundamentals and value score from yfinance data only (Grok off)."""
-        monkeypatch.delenv("XAI_API_KEY", raising=False)
-
         mock_yc = _make_mock_yahoo_client(
-            info=_sample_stock_info(),
+            info=sample_stock_info,
             news=[{"title": "Toyota Q3", "publisher": "Reuters"}],
         )
 
@@ -110,34 +201,8 @@ class TestResearchStock:
         assert result["grok_research"]["recent_news"] == []
         assert result["x_sentiment"]["positive"] == []
 
-    def test_with_grok(self, monkeypatch):
-        """Integrates yfinance data with Grok API deep research + sentiment."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
-
-        # Mock grok_client functions
-        from src.data import grok_client
-        monkeypatch.setattr(grok_client, "is_available", lambda: True)
-        monkeypatch.setattr(
-            grok_client, "search_stock_deep",
-            lambda symbol, name="", timeout=30: _sample_deep_result(),
-        )
-        monkeypatch.setattr(
-            grok_client, "search_x_sentiment",
-            lambda symbol, name="", timeout=30: _sample_sentiment(),
-        )
-
-        mock_yc = _make_mock_yahoo_client(info=_sample_stock_info())
-        result = research_stock("7203.T", mock_yc)
-
-        assert result["grok_research"]["recent_news"] == ["Strong Q3 earnings"]
-        assert result["grok_research"]["catalysts"]["positive"] == ["EV push"]
-        assert result["x_sentiment"]["positive"] == ["Good earnings"]
-        assert result["x_sentiment"]["sentiment_score"] == 0.3
-
-    def test_stock_not_found(self, monkeypatch):
+    def test_stock_not_found(self):
         """Returns empty fundamentals when yahoo_client returns None."""
-        monkeypatch.delenv("XAI_API_KEY", raising=False)
-
         mock_yc = _make_mock_yahoo_client(info=None)
         result = research_stock("INVALID", mock_yc)
 
@@ -146,29 +211,103 @@ class TestResearchStock:
         assert result["fundamentals"]["price"] is None
         assert result["fundamentals"]["sector"] is None
 
-    def test_grok_error(self, monkeypatch):
-        """Graceful degradation when Grok API raises an exception."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
+    @pytest.mark.parametrize(
+        "grok_mode",
+        [
+            pytest.param("off", id="api_unavailable"),
+            pytest.param("ok", id="with_grok"),
+            pytest.param("error", id="grok_error"),
+        ],
+    )
+    def test_grok_branch(
+        self, request, monkeypatch, grok_mode, sample_deep_result, sample_sentiment,
+    ):
+        """Grok results are merged when available; empty on unavailable/error."""
+        if grok_mode != "off":
+            request.getfixturevalue("grok_enabled")
+            if grok_mode == "ok":
+                deep = lambda symbol, name="", timeout=30: sample_deep_result
+                sentiment = lambda symbol, name="", timeout=30: sample_sentiment
+            else:
+                deep = sentiment = _raise_api_down
+            monkeypatch.setattr(grok_client, "search_stock_deep", deep)
+            monkeypatch.setattr(grok_client, "search_x_sentiment", sentiment)
+
+        result = research_stock("7203.T", _YC_DEFAULT)
+
+        if grok_mode == "ok":
+            assert result["grok_research"] == sample_deep_result
+            assert result["x_sentiment"] == sample_sentiment
+        else:
+            # Should not raise; returns empty grok results
+            assert result["grok_research"] == _empty_stock_deep()
+            assert result["x_sentiment"] == _empty_sentiment()
+        # Fundamentals should always work
+        assert result["fundamentals"]["per"] == 10.5
 
-        from src.data import grok_client
-        monkeypatch.setattr(grok_client, "is_available", lambda: True)
-        monkeypatch.setattr(
-            grok_client, "search_stock_deep",
-            MagicMock(side_effect=RuntimeError("API down")),
-        )
-        monkeypatch.setattr(
-            grok_client, "search_x_sentiment",
-            MagicMock(side_effect=RuntimeError("API down")),
-        )
+    def test_sequential_calls_reuse_pooled_adapter(self, grok_enabled):
+        """Grok calls from two research_stock runs share one pooled adapter."""
+        adapters = []
+        lock = threading.Lock()
 
-        mock_yc = _make_mock_yahoo_client(info=_sample_stock_info())
-        result = research_stock("7203.T", mock_yc)
+        def send(adapter, request, **kwargs):
+            with lock:
+                adapters.append(adapter)
+            response = requests.Response()
+            response.status_code = 200
+            response._content = b'{"output": []}'
+            response.request = request
+            response.url = request.url
+            return response
 
-        # Should not raise; returns empty grok results
-        assert result["grok_research"]["recent_news"] == []
-        assert result["x_sentiment"]["positive"] == []
-        # Fundamentals should still work
-        assert result["fundamentals"]["per"] == 10.5
+        grok_enabled.setattr(requests.adapters.HTTPAdapter, "send", send)
+
+        research_stock("7203.T", _YC_DEFAULT)
+        research_stock("7203.T", _YC_DEFAULT)
+
+        # deep research + X sentiment, twice, all through the same pool
+        assert len(adapters) == 4
+        assert all(a is adapters[0] for a in adapters)
+
+    def test_grok_workers_persist_across_calls(self, grok_enabled):
+        """research_stock reuses the same worker threads on every call."""
+        threads = set()
+
+        def record(symbol, name="", timeout=30):
+            threads.add(threading.current_thread())
+            return None
+
+        grok_enabled.setattr(grok_client, "search_stock_deep", record)
+        grok_enabled.setattr(grok_client, "search_x_sentiment", record)
+
+        for _ in range(3):
+            research_stock("7203.T", _YC_DEFAULT)
+
+        assert 1 <= len(threads) <= 2
+        assert all(t.name.startswith("grok") and t.is_alive() for t in threads)
+
+    def test_grok_calls_run_concurrently(
+        self, grok_enabled, sample_deep_result, sample_sentiment,
+    ):
+        """Deep research and X sentiment are in flight at the same time."""
+        # Each stub waits for the other; a sequential caller would time out
+        barrier = threading.Barrier(2, timeout=5)
+
+        def deep(symbol, name="", timeout=30):
+            barrier.wait()
+            return sample_deep_result
+
+        def sentiment(symbol, name="", timeout=30):
+            barrier.wait()
+            return sample_sentiment
+
+        grok_enabled.setattr(grok_client, "search_stock_deep", deep)
+        grok_enabled.setattr(grok_client, "search_x_sentiment", sentiment)
+
+        result = research_stock("7203.T", _YC_DEFAULT)
+
+        assert result["grok_research"] == sample_deep_result
+        assert result["x_sentiment"] == sample_sentiment
 
 
 # ===================================================================
@@ -177,25 +316,10 @@ class TestResearchStock:
 
 class TestResearchIndustry:
 
-    def test_with_grok(self, monkeypatch):
-        """Returns industry data when Grok API is available."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
-
-        industry_data = {
-            "trends": ["AI chip demand"],
-            "key_players": [{"name": "TSMC", "ticker": "TSM", "note": "Leader"}],
-            "growth_drivers": ["Data center"],
-            "risks": ["Geopolitics"],
-            "regulatory": ["Export controls"],
-            "investor_focus": ["CAPEX"],
-            "raw_response": "...",
-        }
-
-        from src.data import grok_client
-        monkeypatch.setattr(grok_client, "is_available", lambda: True)
-        monkeypatch.setattr(
-            grok_client, "search_industry",
-            lambda theme, timeout=30: industry_data,
+    def test_with_grok(self, grok_enabled):
+        """Returns the Grok industry data when the API is available."""
+        grok_enabled.setattr(
+            grok_client, "search_industry", lambda theme, timeout=30: _INDUSTRY_DATA,
         )
 
         result = research_industry("半導体")
@@ -203,19 +327,16 @@ class TestResearchIndustry:
         assert result["theme"] == "半導体"
         assert result["type"] == "industry"
         assert result["api_unavailable"] is False
-        assert result["grok_research"]["trends"] == ["AI chip demand"]
-        assert len(result["grok_research"]["key_players"]) == 1
-
-    def test_api_unavailable(self, monkeypatch):
-        """Returns api_unavailable=True when Grok is not set."""
-        monkeypatch.delenv("XAI_API_KEY", raising=False)
+        assert result["grok_research"] == _INDUSTRY_DATA
 
-        result = research_industry("EV")
+    def test_api_unavailable(self):
+        """Without Grok, returns an empty industry result flagged unavailable."""
+        result = research_industry("半導体")
 
-        assert result["theme"] == "EV"
+        assert result["theme"] == "半導体"
         assert result["type"] == "industry"
         assert result["api_unavailable"] is True
-        assert result["grok_research"]["trends"] == []
+        assert result["grok_research"] == _empty_industry()
 
 
 # ===================================================================
@@ -224,24 +345,10 @@ class TestResearchIndustry:
 
 class TestResearchMarket:
 
-    def test_with_grok(self, monkeypatch):
-        """Returns market data when Grok API is available."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
-
-        market_data = {
-            "price_action": "Nikkei up 1.5%",
-            "macro_factors": ["BOJ decision"],
-            "sentiment": {"score": 0.4, "summary": "Optimistic"},
-            "upcoming_events": ["GDP Friday"],
-            "sector_rotation": ["Defensive to cyclical"],
-            "raw_response": "...",
-        }
-
-        from src.data import grok_client
-        monkeypatch.setattr(grok_client, "is_available", lambda: True)
-        monkeypatch.setattr(
-            grok_client, "search_market",
-            lambda market, timeout=30: market_data,
+    def test_with_grok(self, grok_enabled):
+        """Returns the Grok market data when the API is available."""
+        grok_enabled.setattr(
+            grok_client, "search_market", lambda market, timeout=30: _MARKET_DATA,
         )
 
         result = research_market("日経平均")
@@ -249,27 +356,21 @@ class TestResearchMarket:
         assert result["market"] == "日経平均"
         assert result["type"] == "market"
         assert result["api_unavailable"] is False
-        assert result["grok_research"]["price_action"] == "Nikkei up 1.5%"
-        assert result["grok_research"]["sentiment"]["score"] == 0.4
+        assert result["grok_research"] == _MARKET_DATA
         assert "macro_indicators" in result
 
-    def test_api_unavailable(self, monkeypatch):
-        """Returns api_unavailable=True when Grok is not set."""
-        monkeypatch.delenv("XAI_API_KEY", raising=False)
-
-        result = research_market("S&P500")
+    def test_api_unavailable(self):
+        """Without Grok, returns an empty market result flagged unavailable."""
+        result = research_market("日経平均")
 
-        assert result["market"] == "S&P500"
+        assert result["market"] == "日経平均"
         assert result["type"] == "market"
         assert result["api_unavailable"] is True
-        assert result["grok_research"]["price_action"] == ""
-        assert result["grok_research"]["macro_factors"] == []
+        assert result["grok_research"] == _empty_market()
         assert "macro_indicators" in result
 
-    def test_with_macro_indicators(self, monkeypatch):
+    def test_with_macro_indicators(self):
         """yahoo_client_module with get_macro_indicators → macro_indicators populated."""
-        monkeypatch.delenv("XAI_API_KEY", raising=False)
-
         mock_yc = MagicMock()
         mock_yc.get_macro_indicators.return_value = [
             {"name": "S&P500", "symbol": "^GSPC", "price": 5000.0,
@@ -285,18 +386,14 @@ class TestResearchMarket:
         assert result["macro_indicators"][1]["price"] == 18.5
         mock_yc.get_macro_indicators.assert_called_once()
 
-    def test_without_yahoo_client(self, monkeypatch):
+    def test_without_yahoo_client(self):
         """yahoo_client_module=None → macro_indicators is empty."""
-        monkeypatch.delenv("XAI_API_KEY", raising=False)
-
         result = research_market("S&P500")
 
         assert result["macro_indicators"] == []
 
-    def test_grok_unavailable_still_has_macro(self, monkeypatch):
+    def test_grok_unavailable_still_has_macro(self):
         """Grok API unavailable but macro_indicators still returned."""
-        monkeypatch.delenv("XAI_API_KEY", raising=False)
-
         mock_yc = MagicMock()
         mock_yc.get_macro_indicators.return_value = [
             {"name": "VIX", "symbol": "^VIX", "price": 25.0,
@@ -316,10 +413,8 @@ class TestResearchMarket:
 
 class TestResearchBusiness:
 
-    def test_with_grok(self, monkeypatch):
+    def test_with_grok(self, grok_enabled):
         """Returns business model data when Grok API is available."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
-
         business_data = {
             "overview": "Canon is a diversified imaging company",
             "segments": [{"name": "Printing", "revenue_share": "55%", "description": "Printers"}],
@@ -331,9 +426,7 @@ class TestResearchBusiness:
             "raw_response": "...",
         }
 
-        from src.data import grok_client
-        monkeypatch.setattr(grok_client, "is_available", lambda: True)
-        monkeypatch.setattr(
+        grok_enabled.setattr(
             grok_client, "search_business",
             lambda symbol, name="", timeout=30: business_data,
         )
@@ -348,10 +441,8 @@ class TestResearchBusiness:
         assert result["grok_research"]["overview"] == "Canon is a diversified imaging company"
         assert len(result["grok_research"]["segments"]) == 1
 
-    def test_api_unavailable(self, monkeypatch):
+    def test_api_unavailable(self):
         """Returns api_unavailable=True when Grok is not set."""
-        monkeypatch.delenv("XAI_API_KEY", raising=False)
-
         mock_yc = _make_mock_yahoo_client(info={"name": "Canon Inc."})
         result = research_business("7751.T", mock_yc)
 
@@ -362,15 +453,10 @@ class TestResearchBusiness:
         assert result["grok_research"]["overview"] == ""
         assert result["grok_research"]["segments"] == []
 
-    def test_grok_error(self, monkeypatch):
+    def test_grok_error(self, grok_enabled):
         """Graceful degradation when Grok API raises an exception."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
-
-        from src.data import grok_client
-        monkeypatch.setattr(grok_client, "is_available", lambda: True)
-        monkeypatch.setattr(
-            grok_client, "search_business",
-            MagicMock(side_effect=RuntimeError("API down")),
+        grok_enabled.setattr(
+            grok_client, "search_business", _raise_api_down,
         )
 
         mock_yc = _make_mock_yahoo_client(info={"name": "Canon Inc."})
@@ -379,10 +465,8 @@ class TestResearchBusiness:
         assert result["api_unavailable"] is False
         assert result["grok_research"]["overview"] == ""
 
-    def test_stock_not_found(self, monkeypatch):
+    def test_stock_not_found(self):
         """Returns empty name when yahoo_client returns None."""
-        monkeypatch.delenv("XAI_API_KEY", raising=False)
-
         mock_yc = _make_mock_yahoo_client(info=None)
         result = research_business("INVALID", mock_yc)
 
@@ -1,13 +1,12 @@
 """Tests for src/core/return_estimate.py (KIK-359)."""
 
-import sys
-from pathlib import Path
+import array
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
-
+from src.core.portfolio import portfolio_manager
 from src.core.return_estimate import (
     _is_etf,
     _compute_buyback_yield,
@@ -43,6 +42,16 @@ class TestIsEtf:
         detail = {"target_mean_price": 100.0, "sector": None}
         assert _is_etf(detail) is False
 
+    def test_analyst_target_overrides_etf_quote_type(self):
+        """Analyst coverage wins even over quoteType == "ETF"."""
+        detail = {"target_mean_price": 100.0, "quoteType": "ETF", "sector": None}
+        assert _is_etf(detail) is False
+
+    def test_fundamentals_without_sector_not_etf(self):
+        """Any fundamental (e.g. revenue_history) means not an ETF."""
+        detail = {"target_mean_price": None, "sector": None, "revenue_history": [1.0]}
+        assert _is_etf(detail) is False
+
 
 # ---------------------------------------------------------------------------
 # _estimate_from_analyst
@@ -71,6 +80,20 @@ class TestEstimateFromAnalyst:
         # pessimistic: (80-100)/100 + 0.02 = -0.18
         assert abs(result["pessimistic"] - (-0.18)) < 0.001
 
+    def test_returns_match_plain_division(self):
+        """Scenario returns are exactly (target - price) / price, bit for bit."""
+        detail = {
+            "price": 175.5,
+            "target_high_price": 2500.0,
+            "target_mean_price": 190.0,
+            "target_low_price": 150.0,
+            "number_of_analyst_opinions": 10,
+        }
+        result = _estimate_from_analyst(detail)
+        # (190.0 - 175.5) * (1 / 175.5) would differ in the last bit
+        assert result["base"] == (190.0 - 175.5) / 175.5
+        assert result["optimistic"] == (2500.0 - 175.5) / 175.5
+
     def test_no_dividend(self):
         """No dividend yield means 0 dividend component."""
         detail = {
@@ -268,7 +291,7 @@ class TestEstimateFromHistory:
         """Base return uses CAGR, capped with spread preserved."""
         # 24 months of 10% monthly growth: CAGR very high (>50%)
         # Optimistic caps at 50%, base shifts down to preserve spread
-        prices = [100.0]
+        prices = array.array("d", [100.0])
         for month in range(24):
             start = prices[-1]
             for day in range(21):
@@ -291,7 +314,7 @@ class TestEstimateFromHistory:
         """CAGR for moderate growth produces reasonable estimate."""
         # 24 months of ~1% monthly growth: total ≈ 1.01^24 ≈ 1.27
         # CAGR = 1.27^(12/24) - 1 ≈ 0.127 (12.7%)
-        prices = [100.0]
+        prices = array.array("d", [100.0])
         for month in range(24):
             start = prices[-1]
             for day in range(21):
@@ -306,6 +329,14 @@ class TestEstimateFromHistory:
         assert result["optimistic"] > result["base"]
         assert result["pessimistic"] < result["base"]
 
+    def test_non_positive_month_start_skipped(self):
+        """Months whose starting price is <= 0 are excluded from data_months."""
+        prices = [100.0] * 130
+        prices[21] = 0.0
+        result = _estimate_from_history({"price_history": prices})
+        # 130 days -> 7 monthly samples -> 6 intervals, one starts at 0
+        assert result["data_months"] == 5
+
 
 # ---------------------------------------------------------------------------
 # estimate_stock_return
@@ -367,23 +398,31 @@ class TestEstimateStockReturn:
 # estimate_portfolio_return
 # ---------------------------------------------------------------------------
 
+@pytest.fixture
+def portfolio_env(monkeypatch):
+    """Stub portfolio_manager I/O; tests assign .positions and .fx_rates."""
+    env = SimpleNamespace(positions=[], fx_rates={"JPY": 1.0})
+    monkeypatch.setattr(portfolio_manager, "load_portfolio", lambda _path: env.positions)
+    monkeypatch.setattr(portfolio_manager, "get_fx_rates", lambda _client: env.fx_rates)
+    return env
+
+
+@pytest.fixture
+def mock_client():
+    """yahoo_client stand-in with no news by default."""
+    client = MagicMock()
+    client.get_stock_news.return_value = []
+    return client
+
+
 class TestEstimatePortfolioReturn:
-    @patch("src.core.portfolio.portfolio_manager._infer_currency")
-    @patch("src.core.portfolio.portfolio_manager.get_fx_rates")
-    @patch("src.core.portfolio.portfolio_manager.load_portfolio")
-    def test_portfolio_weighted_average(
-        self, mock_load, mock_fx, mock_infer
-    ):
+    def test_portfolio_weighted_average(self, portfolio_env, mock_client):
         """Portfolio return is value-weighted average of stock returns."""
-        mock_load.return_value = [
+        portfolio_env.positions = [
             {"symbol": "AAPL", "shares": 10, "cost_price": 150.0, "cost_currency": "USD"},
             {"symbol": "7203.T", "shares": 100, "cost_price": 2800.0, "cost_currency": "JPY"},
         ]
-        mock_fx.return_value = {"JPY": 1.0, "USD": 150.0}
-        mock_infer.return_value = "USD"
-
-        # Mock yahoo_client
-        mock_client = MagicMock()
+        portfolio_env.fx_rates = {"JPY": 1.0, "USD": 150.0}
 
         # AAPL detail
         aapl_detail = {
@@ -420,7 +459,6 @@ class TestEstimatePortfolioReturn:
             return toyota_detail
 
         mock_client.get_stock_detail.side_effect = mock_get_detail
-        mock_client.get_stock_news.return_value = []
 
         # Patch grok_client import inside estimate_portfolio_return
         with patch.dict("sys.modules", {"src.data.grok_client": MagicMock(is_available=lambda: False)}):
@@ -430,27 +468,20 @@ class TestEstimatePortfolioReturn:
         assert result["portfolio"]["base"] is not None
         assert result["total_value_jpy"] > 0
 
-    @patch("src.core.portfolio.portfolio_manager.load_portfolio")
-    def test_empty_portfolio(self, mock_load):
+    def test_empty_portfolio(self, portfolio_env, mock_client):
         """Empty portfolio returns empty result."""
-        mock_load.return_value = []
-        mock_client = MagicMock()
+        portfolio_env.positions = []
 
         result = estimate_portfolio_return("/fake/path.csv", mock_client)
         assert result["positions"] == []
         assert result["portfolio"]["base"] is None
 
-    @patch("src.core.portfolio.portfolio_manager._infer_currency")
-    @patch("src.core.portfolio.portfolio_manager.get_fx_rates")
-    @patch("src.core.portfolio.portfolio_manager.load_portfolio")
-    def test_failed_fetch_none_shows_no_data(self, mock_load, mock_fx, mock_infer):
+    def test_failed_fetch_none_shows_no_data(self, portfolio_env, mock_client):
         """Stock with None detail appears with method='no_data'."""
-        mock_load.return_value = [
+        portfolio_env.positions = [
             {"symbol": "FAIL.T", "shares": 100, "cost_price": 1000.0, "cost_currency": "JPY"},
         ]
-        mock_fx.return_value = {"JPY": 1.0}
-        mock_infer.return_value = "JPY"
-        mock_client = MagicMock()
+        portfolio_env.fx_rates = {"JPY": 1.0}
         mock_client.get_stock_detail.return_value = None
         with patch("src.data.grok_client.is_available", return_value=False):
             result = estimate_portfolio_return("/fake/path.csv", mock_client)
@@ -458,17 +489,12 @@ class TestEstimatePortfolioReturn:
         assert result["positions"][0]["method"] == "no_data"
         assert result["positions"][0]["base"] is None
 
-    @patch("src.core.portfolio.portfolio_manager._infer_currency")
-    @patch("src.core.portfolio.portfolio_manager.get_fx_rates")
-    @patch("src.core.portfolio.portfolio_manager.load_portfolio")
-    def test_failed_fetch_no_price_shows_no_data(self, mock_load, mock_fx, mock_infer):
+    def test_failed_fetch_no_price_shows_no_data(self, portfolio_env, mock_client):
         """Stock with price=None in detail also appears as 'no_data'."""
-        mock_load.return_value = [
+        portfolio_env.positions = [
             {"symbol": "9856.T", "shares": 100, "cost_price": 500.0, "cost_currency": "JPY"},
         ]
-        mock_fx.return_value = {"JPY": 1.0}
-        mock_infer.return_value = "JPY"
-        mock_client = MagicMock()
+        portfolio_env.fx_rates = {"JPY": 1.0}
         mock_client.get_stock_detail.return_value = {"price": None, "name": "Test"}
         with patch("src.data.grok_client.is_available", return_value=False):
             result = estimate_portfolio_return("/fake/path.csv", mock_client)
@@ -476,24 +502,18 @@ class TestEstimatePortfolioReturn:
         assert result["positions"][0]["method"] == "no_data"
         assert result["positions"][0]["base"] is None
 
-    @patch("src.core.portfolio.portfolio_manager._infer_currency")
-    @patch("src.core.portfolio.portfolio_manager.get_fx_rates")
-    @patch("src.core.portfolio.portfolio_manager.load_portfolio")
-    def test_forecast_never_calls_grok(self, mock_load, mock_fx, mock_infer):
+    def test_forecast_never_calls_grok(self, portfolio_env, mock_client):
         """Forecast should never call Grok API (KIK-369)."""
-        mock_load.return_value = [
+        portfolio_env.positions = [
             {"symbol": "AAPL", "shares": 10, "cost_price": 150.0, "cost_currency": "USD"},
         ]
-        mock_fx.return_value = {"USD": 150.0}
-        mock_infer.return_value = "USD"
-        mock_client = MagicMock()
+        portfolio_env.fx_rates = {"USD": 150.0}
         mock_client.get_stock_detail.return_value = {
             "price": 200.0, "target_mean_price": 250.0,
             "target_high_price": 280.0, "target_low_price": 220.0,
             "dividend_yield": 0.01, "number_of_analyst_opinions": 30,
             "recommendation_mean": 2.0, "forward_per": 25.0,
         }
-        mock_client.get_stock_news.return_value = []
 
         mock_grok = MagicMock()
         with patch.dict("sys.modules", {"src.data.grok_client": mock_grok}):
@@ -502,18 +522,13 @@ class TestEstimatePortfolioReturn:
         mock_grok.search_x_sentiment.assert_not_called()
         assert result["positions"][0]["x_sentiment"] is None
 
-    @patch("src.core.portfolio.portfolio_manager._infer_currency")
-    @patch("src.core.portfolio.portfolio_manager.get_fx_rates")
-    @patch("src.core.portfolio.portfolio_manager.load_portfolio")
-    def test_cash_position_skips_api(self, mock_load, mock_fx, mock_infer):
+    def test_cash_position_skips_api(self, portfolio_env, mock_client):
         """Cash positions (.CASH) should not trigger API calls (KIK-361)."""
-        mock_load.return_value = [
+        portfolio_env.positions = [
             {"symbol": "JPY.CASH", "shares": 1, "cost_price": 500000.0, "cost_currency": "JPY"},
             {"symbol": "AAPL", "shares": 10, "cost_price": 150.0, "cost_currency": "USD"},
         ]
-        mock_fx.return_value = {"JPY": 1.0, "USD": 150.0}
-        mock_infer.return_value = "USD"
-        mock_client = MagicMock()
+        portfolio_env.fx_rates = {"JPY": 1.0, "USD": 150.0}
         mock_client.get_stock_detail.return_value = {
             "price": 200.0, "name": "Apple", "currency": "USD",
             "target_mean_price": 220.0, "target_high_price": 250.0,
@@ -521,7 +536,6 @@ class TestEstimatePortfolioReturn:
             "number_of_analyst_opinions": 30, "recommendation_mean": 2.0,
             "forward_per": 28.0, "sector": "Technology",
         }
-        mock_client.get_stock_news.return_value = []
 
         with patch.dict("sys.modules", {"src.data.grok_client": MagicMock(is_available=lambda: False)}):
             result = estimate_portfolio_return("/fake/path.csv", mock_client)
@@ -539,3 +553,23 @@ class TestEstimatePortfolioReturn:
         detail_calls = [c[0][0] for c in mock_client.get_stock_detail.call_args_list]
         assert "JPY.CASH" not in detail_calls
         assert "AAPL" in detail_calls
+
+    def test_fetch_keeps_order_and_dedupes(self, portfolio_env, mock_client):
+        """Symbols are fetched once each and positions keep portfolio order."""
+        portfolio_env.positions = [
+            {"symbol": "AAPL", "shares": 10, "cost_price": 150.0, "cost_currency": "USD"},
+            {"symbol": "MSFT", "shares": 5, "cost_price": 300.0, "cost_currency": "USD"},
+            {"symbol": "AAPL", "shares": 3, "cost_price": 160.0, "cost_currency": "USD"},
+        ]
+        portfolio_env.fx_rates = {"USD": 150.0}
+        mock_client.get_stock_detail.side_effect = lambda sym: {
+            "price": 200.0 if sym == "AAPL" else 400.0, "currency": "USD",
+            "target_mean_price": 220.0, "number_of_analyst_opinions": 10,
+        }
+
+        result = estimate_portfolio_return("/fake/path.csv", mock_client)
+
+        assert [p["symbol"] for p in result["positions"]] == ["AAPL", "MSFT", "AAPL"]
+        assert [p["shares"] for p in result["positions"]] == [10, 5, 3]
+        assert mock_client.get_stock_detail.call_count == 2
+        assert mock_client.get_stock_news.call_count == 2
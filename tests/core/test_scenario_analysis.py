@@ -1,5 +1,8 @@
 """Tests for src.core.risk.scenario_analysis module."""
 
+import json
+
+import numpy as np
 import pytest
 
 from src.core.risk.scenario_analysis import (
@@ -85,6 +88,21 @@ class TestResolveScenario:
             assert result is not None
             assert result["base_shock"] == -0.10
 
+    def test_alias_with_whitespace_and_case(self):
+        """Aliases are matched after strip/lower, same as scenario keys."""
+        assert resolve_scenario("  Recession ") is resolve_scenario("recession")
+
+    def test_partial_alias_match(self):
+        """Input containing an alias still resolves via partial match."""
+        assert resolve_scenario("米国リセッション懸念") is SCENARIOS["us_recession"]
+
+    def test_repeated_lookup_is_cached(self):
+        """Repeated free-text lookups are served from the cache."""
+        resolve_scenario.cache_clear()
+        first = resolve_scenario("米国リセッション懸念")
+        assert resolve_scenario("米国リセッション懸念") is first
+        assert resolve_scenario.cache_info().hits == 1
+
 
 # ===================================================================
 # _infer_currency / _infer_region helpers
@@ -105,6 +123,12 @@ class TestInferCurrency:
     def test_no_suffix_defaults_usd(self):
         assert _infer_currency("AAPL", {}) == "USD"
 
+    def test_stock_info_not_shadowed_by_cached_suffix(self):
+        """A memoized suffix lookup must not override stock_info['currency']."""
+        assert _infer_currency("7203.T", {}) == "JPY"
+        assert _infer_currency("7203.T", {"currency": "USD"}) == "USD"
+        assert _infer_currency("7203.T", {}) == "JPY"
+
 
 class TestInferRegion:
     def test_from_stock_info_country(self):
@@ -116,6 +140,10 @@ class TestInferRegion:
     def test_no_suffix_defaults_us(self):
         assert _infer_region("AAPL", {}) == "US"
 
+    def test_stock_info_not_shadowed_by_cached_suffix(self):
+        assert _infer_region("D05.SI", {}) == "Singapore"
+        assert _infer_region("D05.SI", {"region": "Asia"}) == "Asia"
+
 
 # ===================================================================
 # compute_stock_scenario_impact
@@ -284,6 +312,24 @@ class TestPortfolioScenario:
         assert result["stock_impacts"][1]["weight"] == 0.4
         assert isinstance(result["portfolio_impact"], float)
 
+    def test_numpy_weights_yield_plain_floats(self):
+        """np.float64 weights must not leak numpy scalars into the result."""
+        stocks = [
+            {"symbol": "7203.T", "sector": "Consumer Cyclical", "beta": 1.0, "currency": "JPY"},
+            {"symbol": "AAPL", "sector": "Technology", "beta": 1.2, "currency": "USD"},
+        ]
+        scenario = resolve_scenario("triple_decline")
+        for weights in (np.array([0.6, 0.4]), np.array([1.0])):
+            result = analyze_portfolio_scenario(
+                stocks[: len(weights)], [], weights, scenario
+            )
+            assert type(result["portfolio_impact"]) is float
+            assert type(result["portfolio_value_change"]) is float
+            for imp in result["stock_impacts"]:
+                assert type(imp["weight"]) is float
+                assert type(imp["pf_contribution"]) is float
+            json.dumps(result, ensure_ascii=False)
+
     def test_judgment_severe_scenario(self):
         """Very negative portfolio_impact -> '要対応'."""
         # Use a stock with high beta to maximize impact
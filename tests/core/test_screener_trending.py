@@ -1,14 +1,11 @@
 """Tests for TrendingScreener (KIK-370)."""
 
-import sys
-from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
 
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
-
 from src.core.screening.screener import TrendingScreener
+from src.data import grok_client, yahoo_client
 
 
 # ===================================================================
@@ -49,12 +46,22 @@ def _make_grok_result(stocks, context=""):
     return {"stocks": stocks, "market_context": context, "raw_response": "..."}
 
 
+@pytest.fixture
+def mock_yahoo():
+    """yahoo_client stand-in; spec limits it to the module's real API."""
+    return MagicMock(spec=yahoo_client)
+
+
+@pytest.fixture
+def mock_grok():
+    """grok_client stand-in; spec limits it to the module's real API."""
+    return MagicMock(spec=grok_client)
+
+
 class TestTrendingScreen:
-    def test_basic_pipeline(self, stock_info_data):
-        mock_yahoo = MagicMock()
+    def test_basic_pipeline(self, stock_info_data, mock_yahoo, mock_grok):
         mock_yahoo.get_stock_info.return_value = stock_info_data
 
-        mock_grok = MagicMock()
         mock_grok.search_trending_stocks.return_value = _make_grok_result(
             [{"ticker": "7203.T", "name": "Toyota", "reason": "EV push"}],
             context="Bullish mood",
@@ -70,9 +77,7 @@ class TestTrendingScreen:
         assert isinstance(results[0]["value_score"], (int, float))
         assert context == "Bullish mood"
 
-    def test_empty_grok_response(self):
-        mock_yahoo = MagicMock()
-        mock_grok = MagicMock()
+    def test_empty_grok_response(self, mock_yahoo, mock_grok):
         mock_grok.search_trending_stocks.return_value = _make_grok_result([])
 
         screener = TrendingScreener(mock_yahoo, mock_grok)
@@ -81,12 +86,10 @@ class TestTrendingScreen:
         assert results == []
         assert context == ""
 
-    def test_yahoo_returns_none_classified_as_no_data(self):
+    def test_yahoo_returns_none_classified_as_no_data(self, mock_yahoo, mock_grok):
         """Yahoo failure -> 話題×データ不足 (not 割高)."""
-        mock_yahoo = MagicMock()
         mock_yahoo.get_stock_info.return_value = None
 
-        mock_grok = MagicMock()
         mock_grok.search_trending_stocks.return_value = _make_grok_result(
             [{"ticker": "UNKNOWN", "name": "Unknown Corp", "reason": "Hyped"}]
         )
@@ -100,9 +103,7 @@ class TestTrendingScreen:
         assert results[0]["value_score"] == 0.0
         assert results[0]["classification"] == "話題×データ不足"
 
-    def test_sorting_by_classification_then_score(self):
-        mock_yahoo = MagicMock()
-
+    def test_sorting_by_classification_then_score(self, mock_yahoo, mock_grok):
         def get_info(symbol):
             if symbol == "A":
                 return {"symbol": "A", "name": "A", "per": 50.0, "pbr": 5.0}
@@ -116,7 +117,6 @@ class TestTrendingScreen:
 
         mock_yahoo.get_stock_info.side_effect = get_info
 
-        mock_grok = MagicMock()
         mock_grok.search_trending_stocks.return_value = _make_grok_result([
             {"ticker": "A", "name": "", "reason": ""},
             {"ticker": "B", "name": "", "reason": ""},
@@ -129,11 +129,9 @@ class TestTrendingScreen:
         # B (high value score) should be first
         assert results[0]["symbol"] == "B"
 
-    def test_top_n_limit(self):
-        mock_yahoo = MagicMock()
+    def test_top_n_limit(self, mock_yahoo, mock_grok):
         mock_yahoo.get_stock_info.return_value = None
 
-        mock_grok = MagicMock()
         mock_grok.search_trending_stocks.return_value = _make_grok_result(
             [{"ticker": f"T{i}", "name": "", "reason": ""} for i in range(10)]
         )
@@ -143,11 +141,9 @@ class TestTrendingScreen:
 
         assert len(results) == 3
 
-    def test_empty_ticker_skipped(self):
-        mock_yahoo = MagicMock()
+    def test_empty_ticker_skipped(self, mock_yahoo, mock_grok):
         mock_yahoo.get_stock_info.return_value = {"symbol": "7203.T", "name": "Toyota"}
 
-        mock_grok = MagicMock()
         mock_grok.search_trending_stocks.return_value = _make_grok_result([
             {"ticker": "", "name": "No Ticker", "reason": "test"},
             {"ticker": "7203.T", "name": "Toyota", "reason": "test"},
@@ -159,9 +155,7 @@ class TestTrendingScreen:
         assert len(results) == 1
         assert results[0]["symbol"] == "7203.T"
 
-    def test_theme_passed_to_grok(self):
-        mock_yahoo = MagicMock()
-        mock_grok = MagicMock()
+    def test_theme_passed_to_grok(self, mock_yahoo, mock_grok):
         mock_grok.search_trending_stocks.return_value = _make_grok_result([])
 
         screener = TrendingScreener(mock_yahoo, mock_grok)
@@ -171,10 +165,8 @@ class TestTrendingScreen:
             region="us", theme="AI",
         )
 
-    def test_no_data_sorted_last(self):
+    def test_no_data_sorted_last(self, mock_yahoo, mock_grok):
         """Stocks with 話題×データ不足 should sort after 割高."""
-        mock_yahoo = MagicMock()
-
         def get_info(symbol):
             if symbol == "GOOD":
                 return {
@@ -185,7 +177,6 @@ class TestTrendingScreen:
 
         mock_yahoo.get_stock_info.side_effect = get_info
 
-        mock_grok = MagicMock()
         mock_grok.search_trending_stocks.return_value = _make_grok_result([
             {"ticker": "NODATA", "name": "No Data", "reason": "hype"},
             {"ticker": "GOOD", "name": "Good Corp", "reason": "solid"},
@@ -202,11 +193,9 @@ class TestTrendingScreen:
         """CLASSIFICATION_NO_DATA class attribute should be accessible."""
         assert TrendingScreener.CLASSIFICATION_NO_DATA == "話題×データ不足"
 
-    def test_result_fields(self, stock_info_data):
-        mock_yahoo = MagicMock()
+    def test_result_fields(self, stock_info_data, mock_yahoo, mock_grok):
         mock_yahoo.get_stock_info.return_value = stock_info_data
 
-        mock_grok = MagicMock()
         mock_grok.search_trending_stocks.return_value = _make_grok_result(
             [{"ticker": "7203.T", "name": "Toyota", "reason": "Hot"}]
         )
@@ -8,6 +8,7 @@ import pytest
 
 from src.core.risk.shock_sensitivity import (
     _clamp,
+    _fundamental_scores,
     _safe_float,
     classify_quadrant,
     compute_fundamental_sensitivity,
@@ -15,6 +16,7 @@ from src.core.risk.shock_sensitivity import (
     compute_technical_sensitivity,
     analyze_stock_sensitivity,
 )
+from tests.helpers import flat, linear
 
 
 # ---------------------------------------------------------------------------
@@ -22,23 +24,30 @@ from src.core.risk.shock_sensitivity import (
 # ---------------------------------------------------------------------------
 
 def _make_hist(
-    prices: list[float],
-    volumes: list[float] | None = None,
+    prices: np.ndarray | list[float],
+    volumes: np.ndarray | list[float] | None = None,
 ) -> pd.DataFrame:
-    """Create a DataFrame that mimics yahoo_client.get_price_history()."""
-    n = len(prices)
-    dates = pd.bdate_range(end="2025-06-01", periods=n)
+    """Create a DataFrame that mimics yahoo_client.get_price_history().
+
+    shock_sensitivity only reads rows by position, so the default RangeIndex
+    stands in for the real DatetimeIndex.
+    """
     if volumes is None:
-        volumes = [1_000_000] * n
-    return pd.DataFrame({"Close": prices, "Volume": volumes}, index=dates)
+        volumes = flat(len(prices), 1_000_000)
+    # Arrays are built fresh per test, so let the frame use them as-is
+    return pd.DataFrame({"Close": prices, "Volume": volumes}, copy=False)
+
 
+# Degenerate histories shared by the neutral short-circuit tests (read-only)
+_EMPTY_HIST = pd.DataFrame(columns=["Close", "Volume"])
+_NO_CLOSE_HIST = pd.DataFrame({"Open": flat(60, 100.0)})
 
-def _trending_up_then_flat(n: int = 120, base: float = 100.0) -> list[float]:
+
+def _trending_up_then_flat(n: int = 120, base: float = 100.0) -> np.ndarray:
     """Generate prices that trend up steadily then flatten at the end."""
     # 100 days of gradual upward, then 20 days flat/sideways
-    up = [base + i * 0.5 for i in range(n - 20)]
-    flat = [up[-1]] * 20
-    return up + flat
+    up = linear(n - 20, base, 0.5)
+    return np.concatenate([up, flat(20, up[-1])])
 
 
 # ===================================================================
@@ -60,6 +69,9 @@ class TestClamp:
         assert _clamp(0.5) == 0.5
         assert _clamp(2.0) == 2.0
 
+    def test_nan_maps_to_ceiling(self):
+        assert _clamp(float("nan")) == 2.0
+
 
 class TestSafeFloat:
     def test_none(self):
@@ -80,6 +92,18 @@ class TestSafeFloat:
     def test_non_numeric_string(self):
         assert _safe_float("abc", default=99.0) == 99.0
 
+    def test_negative_inf_returns_default(self):
+        assert _safe_float(float("-inf"), default=5.0) == 5.0
+
+    def test_numpy_nan_returns_default(self):
+        """np.float64 is not exactly float, so it takes the coercion path."""
+        assert _safe_float(np.float64("nan"), default=7.0) == 7.0
+        assert _safe_float(np.float64(2.5)) == 2.5
+
+    def test_int_converted_to_float(self):
+        result = _safe_float(3)
+        assert result == 3.0 and type(result) is float
+
 
 # ===================================================================
 # Layer 1: compute_fundamental_sensitivity
@@ -168,6 +192,16 @@ class TestFundamentalSensitivity:
         result = compute_fundamental_sensitivity(info)
         assert result["volatility_score"] == 0.8
 
+    def test_repeated_inputs_hit_score_cache(self):
+        """Same fundamentals across scenarios reuse the cached scores."""
+        _fundamental_scores.cache_clear()
+        info = {"per": 12.0, "pbr": 0.9, "dividend_yield": 0.04, "market_cap": 2e12, "beta": 0.9}
+        first = compute_fundamental_sensitivity(info)
+        second = compute_fundamental_sensitivity(dict(info))
+        assert first == second
+        assert first is not second
+        assert _fundamental_scores.cache_info().hits == 1
+
 
 # ===================================================================
 # Layer 2: compute_technical_sensitivity
@@ -179,7 +213,7 @@ class TestTechnicalSensitivity:
         """RSI > 70 -> rsi_score = 1.5 -> overall high score."""
         # Build a price series that drives RSI above 70:
         # strong consistent upward movement
-        prices = [100.0 + i * 2.0 for i in range(60)]
+        prices = linear(60, 100.0, 2.0)
         hist = _make_hist(prices)
         result = compute_technical_sensitivity(hist)
         # RSI should be high with consistent gains
@@ -189,14 +223,14 @@ class TestTechnicalSensitivity:
     def test_rsi_low_gives_low_score(self):
         """RSI below 30 -> rsi_score = 0.9 (or 0.8 if 30-50)."""
         # Strong consistent downward movement
-        prices = [200.0 - i * 2.0 for i in range(60)]
+        prices = linear(60, 200.0, -2.0)
         hist = _make_hist(prices)
         result = compute_technical_sensitivity(hist)
         assert result["rsi_score"] <= 1.0
 
     def test_insufficient_data_returns_neutral(self):
         """Fewer than 50 data points -> neutral score = 1.0."""
-        prices = [100.0 + i for i in range(30)]  # only 30 points
+        prices = linear(30, 100.0, 1.0)  # only 30 points
         hist = _make_hist(prices)
         result = compute_technical_sensitivity(hist)
         assert result["score"] == 1.0
@@ -204,8 +238,7 @@ class TestTechnicalSensitivity:
 
     def test_empty_dataframe_returns_neutral(self):
         """Empty DataFrame -> neutral."""
-        hist = pd.DataFrame(columns=["Close", "Volume"])
-        result = compute_technical_sensitivity(hist)
+        result = compute_technical_sensitivity(_EMPTY_HIST)
         assert result["score"] == 1.0
 
     def test_none_hist_returns_neutral(self):
@@ -215,8 +248,7 @@ class TestTechnicalSensitivity:
 
     def test_missing_close_column_returns_neutral(self):
         """DataFrame without Close column -> neutral."""
-        hist = pd.DataFrame({"Open": [100.0] * 60})
-        result = compute_technical_sensitivity(hist)
+        result = compute_technical_sensitivity(_NO_CLOSE_HIST)
         assert result["score"] == 1.0
 
     def test_score_always_clamped(self):
@@ -229,7 +261,7 @@ class TestTechnicalSensitivity:
     def test_surge_detection(self):
         """A big 30-day price jump should increase surge_score."""
         # Flat for 60 days, then sharp rise in last 30 days
-        prices = [100.0] * 60 + [100.0 + i * 5 for i in range(1, 31)]
+        prices = np.concatenate([flat(60, 100.0), linear(30, 105.0, 5.0)])
         hist = _make_hist(prices)
         result = compute_technical_sensitivity(hist)
         # With a >100% rise in 30 days, surge_score should be elevated
@@ -237,13 +269,31 @@ class TestTechnicalSensitivity:
 
     def test_volume_heat_detection(self):
         """High recent volume vs. 20-day average should raise volume_heat_score."""
-        prices = [100.0 + i * 0.1 for i in range(60)]
+        prices = linear(60, 100.0, 0.1)
         # Low volume for first 55 days, high volume for last 5
-        volumes = [100_000] * 55 + [500_000] * 5
+        volumes = np.concatenate([flat(55, 100_000), flat(5, 500_000)])
         hist = _make_hist(prices, volumes)
         result = compute_technical_sensitivity(hist)
         assert result["volume_heat_score"] >= 1.0
 
+    def test_volume_heat_skips_nan_volume(self):
+        """NaN volumes are skipped in the averages (as pandas mean() does)."""
+        prices = linear(60, 100.0, 0.1)
+        volumes = np.concatenate(
+            [flat(55, 100_000), flat(3, np.nan), flat(2, 500_000)]
+        )
+        hist = _make_hist(prices, volumes)
+        result = compute_technical_sensitivity(hist)
+        # 5d avg 500k vs 20d avg (15*100k + 2*500k)/17 ~ 147k -> hot
+        assert result["volume_heat_score"] == 1.3
+
+    def test_missing_volume_column_is_neutral_heat(self):
+        """No Volume column -> volume_heat defaults to 1.0 (neutral score)."""
+        prices = linear(60, 100.0, 0.1)
+        hist = _make_hist(prices).drop(columns=["Volume"])
+        result = compute_technical_sensitivity(hist)
+        assert result["volume_heat_score"] == 1.0
+
 
 # ===================================================================
 # classify_quadrant
@@ -251,30 +301,28 @@ class TestTechnicalSensitivity:
 
 
 class TestClassifyQuadrant:
-    def test_most_dangerous(self):
-        """f > 1.2 and t > 1.2 -> quadrant is '最危険'."""
-        result = classify_quadrant(1.5, 1.5)
-        assert result["quadrant"] == "最危険"
-
-    def test_bottom_fall_risk(self):
-        """f > 1.2 and t < 0.9 -> '底抜けリスク'."""
-        result = classify_quadrant(1.5, 0.7)
-        assert result["quadrant"] == "底抜けリスク"
-
-    def test_short_term_correction_risk(self):
-        """f < 1.0 and t > 1.2 -> '短期調整リスク'."""
-        result = classify_quadrant(0.8, 1.5)
-        assert result["quadrant"] == "短期調整リスク"
-
-    def test_strongest_resilience(self):
-        """f < 1.0 and t < 0.9 -> '耐性最強'."""
-        result = classify_quadrant(0.8, 0.7)
-        assert result["quadrant"] == "耐性最強"
-
-    def test_neutral_zone(self):
-        """Middle values -> '中立'."""
-        result = classify_quadrant(1.1, 1.0)
-        assert result["quadrant"] == "中立"
+    @pytest.mark.parametrize(
+        "fundamental,technical,expected",
+        [
+            # f > 1.2 and t > 1.2
+            pytest.param(1.5, 1.5, "最危険", id="most_dangerous"),
+            # f > 1.2 and t < 0.9
+            pytest.param(1.5, 0.7, "底抜けリスク", id="bottom_fall_risk"),
+            # f < 1.0 and t > 1.2
+            pytest.param(0.8, 1.5, "短期調整リスク", id="short_term_correction_risk"),
+            # f < 1.0 and t < 0.9
+            pytest.param(0.8, 0.7, "耐性最強", id="strongest_resilience"),
+            # Middle values
+            pytest.param(1.1, 1.0, "中立", id="neutral_zone"),
+            # Thresholds are strict: 1.2 / 1.0 / 0.9 fall in the middle
+            pytest.param(1.2, 1.2, "中立", id="upper_bounds_neutral"),
+            pytest.param(1.0, 0.9, "中立", id="lower_bounds_neutral"),
+            pytest.param(float("nan"), 1.5, "中立", id="nan_neutral"),
+        ],
+    )
+    def test_quadrant(self, fundamental, technical, expected):
+        """Each (fundamental, technical) region maps to its quadrant name."""
+        assert classify_quadrant(fundamental, technical)["quadrant"] == expected
 
     def test_result_has_emoji_and_description(self):
         """All results should have emoji and description keys."""
@@ -283,6 +331,11 @@ class TestClassifyQuadrant:
         assert "description" in result
         assert len(result["description"]) > 0
 
+    def test_result_is_independent_copy(self):
+        """Mutating one result must not leak into later classifications."""
+        classify_quadrant(1.1, 1.0)["quadrant"] = "changed"
+        assert classify_quadrant(1.1, 1.0)["quadrant"] == "中立"
+
 
 # ===================================================================
 # compute_integrated_shock
@@ -290,27 +343,20 @@ class TestClassifyQuadrant:
 
 
 class TestIntegratedShock:
-    def test_base_calculation(self):
-        """adjusted_shock = base * f * t * c."""
-        result = compute_integrated_shock(
-            base_shock=-0.20,
-            fundamental_score=1.5,
-            technical_score=1.2,
-            concentration_multiplier=1.1,
-        )
-        expected = -0.20 * 1.5 * 1.2 * 1.1
-        assert abs(result["adjusted_shock"] - round(expected, 6)) < 1e-5
-
-    def test_neutral_scores_preserve_base_shock(self):
-        """All scores = 1.0 -> adjusted_shock = base_shock."""
-        result = compute_integrated_shock(-0.20, 1.0, 1.0, 1.0)
-        assert abs(result["adjusted_shock"] - (-0.20)) < 1e-5
-
-    def test_scores_clamped(self):
-        """Out-of-range scores should be clamped."""
-        result = compute_integrated_shock(-0.20, 5.0, 5.0, 0.1)
-        # f and t clamped to 2.0, c floored at 0.5
-        expected = -0.20 * 2.0 * 2.0 * 0.5
+    @pytest.mark.parametrize(
+        "scores,expected",
+        [
+            # adjusted_shock = base * f * t * c
+            pytest.param((1.5, 1.2, 1.1), -0.20 * 1.5 * 1.2 * 1.1, id="base_calculation"),
+            # All scores = 1.0 -> adjusted_shock = base_shock
+            pytest.param((1.0, 1.0, 1.0), -0.20, id="neutral_preserves_base"),
+            # f and t clamped to 2.0, c floored at 0.5
+            pytest.param((5.0, 5.0, 0.1), -0.20 * 2.0 * 2.0 * 0.5, id="scores_clamped"),
+        ],
+    )
+    def test_adjusted_shock(self, scores, expected):
+        """adjusted_shock is the base shock scaled by the (clamped) layer scores."""
+        result = compute_integrated_shock(-0.20, *scores)
         assert abs(result["adjusted_shock"] - round(expected, 6)) < 1e-5
 
     def test_result_contains_quadrant(self):
@@ -377,9 +423,7 @@ class TestAnalyzeStockSensitivity:
         """Empty DataFrame -> technical = neutral."""
         stock_info = {"symbol": "EMPTY", "per": 15.0, "pbr": 1.0,
                       "dividend_yield": 0.02, "market_cap": 1e11, "beta": 1.0}
-        hist = pd.DataFrame()
-
-        result = analyze_stock_sensitivity(stock_info, hist)
+        result = analyze_stock_sensitivity(stock_info, _EMPTY_HIST)
         assert result["technical"]["score"] == 1.0
 
     def test_concentration_multiplier_applied(self):
@@ -70,7 +70,7 @@ class TestSearchXSentiment:
         assert result["sentiment_score"] == 0.0
         assert result["raw_response"] == ""
 
-    @patch("src.data.grok_client.requests.post")
+    @patch("src.data.grok_client._post")
     def test_successful_response(self, mock_post, monkeypatch):
         """Parses a successful Grok API response."""
         monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
@@ -101,7 +101,7 @@ class TestSearchXSentiment:
         assert result["sentiment_score"] == 0.6
         assert result["raw_response"] == json_content
 
-    @patch("src.data.grok_client.requests.post")
+    @patch("src.data.grok_client._post")
     def test_api_error(self, mock_post, monkeypatch):
         """Returns empty result on API error (graceful degradation)."""
         monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
@@ -114,7 +114,7 @@ class TestSearchXSentiment:
         assert result["positive"] == []
         assert result["sentiment_score"] == 0.0
 
-    @patch("src.data.grok_client.requests.post")
+    @patch("src.data.grok_client._post")
     def test_timeout(self, mock_post, monkeypatch):
         """Returns empty result on timeout."""
         import requests as req
@@ -124,7 +124,7 @@ class TestSearchXSentiment:
         result = search_x_sentiment("AAPL", timeout=1)
         assert result["positive"] == []
 
-    @patch("src.data.grok_client.requests.post")
+    @patch("src.data.grok_client._post")
     def test_malformed_json_response(self, mock_post, monkeypatch):
         """Handles malformed JSON in response."""
         monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
@@ -147,7 +147,7 @@ class TestSearchXSentiment:
         assert result["raw_response"] == "This is not JSON at all"
         assert result["positive"] == []
 
-    @patch("src.data.grok_client.requests.post")
+    @patch("src.data.grok_client._post")
     def test_sentiment_score_clamping(self, mock_post, monkeypatch):
         """Sentiment score is clamped to [-1, 1]."""
         monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
@@ -175,7 +175,7 @@ class TestSearchXSentiment:
         result = search_x_sentiment("AAPL")
         assert result["sentiment_score"] == 1.0
 
-    @patch("src.data.grok_client.requests.post")
+    @patch("src.data.grok_client._post")
     def test_empty_output(self, mock_post, monkeypatch):
         """Returns empty result when API returns no output."""
         monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
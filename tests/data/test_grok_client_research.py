@@ -4,10 +4,13 @@ Tests for _call_grok_api, _parse_json_response, _is_japanese_stock,
 _contains_japanese, search_stock_deep, search_industry, search_market.
 """
 
+import copy
 import json
 import sys
+import threading
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 
@@ -18,6 +21,7 @@ from src.data.grok_client import (
     _parse_json_response,
     _is_japanese_stock,
     _contains_japanese,
+    _fresh_copy,
     search_stock_deep,
     search_industry,
     search_market,
@@ -26,6 +30,7 @@ from src.data.grok_client import (
     EMPTY_INDUSTRY,
     EMPTY_MARKET,
     EMPTY_BUSINESS,
+    EMPTY_TRENDING,
 )
 
 
@@ -33,11 +38,13 @@ from src.data.grok_client import (
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _make_grok_response(text: str) -> MagicMock:
-    """Build a mock HTTP response that returns *text* as API output."""
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {
+def _make_grok_response(text: str) -> SimpleNamespace:
+    """Build a stub HTTP response that returns *text* as API output.
+
+    _call_grok_api only reads ``status_code`` and calls ``json()``, so a
+    plain namespace is enough (no MagicMock attribute machinery).
+    """
+    payload = {
         "output": [
             {
                 "type": "message",
@@ -47,7 +54,7 @@ def _make_grok_response(text: str) -> MagicMock:
             }
         ]
     }
-    return mock_response
+    return SimpleNamespace(status_code=200, json=lambda: payload)
 
 
 @pytest.fixture(autouse=True)
@@ -58,6 +65,12 @@ def _reset_error_warned():
     yield
 
 
+@pytest.fixture(autouse=True)
+def _xai_key(monkeypatch):
+    """Provide an API key to every test; no-key tests delenv it again."""
+    monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
+
+
 # ===================================================================
 # _call_grok_api
 # ===================================================================
@@ -70,46 +83,61 @@ class TestCallGrokApi:
         result = _call_grok_api("test prompt")
         assert result == ""
 
-    @patch("src.data.grok_client.requests.post")
-    def test_successful_response(self, mock_post, monkeypatch):
+    @patch("src.data.grok_client._post")
+    def test_successful_response(self, mock_post):
         """Returns text content from a successful API response."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
         mock_post.return_value = _make_grok_response("Hello from Grok")
 
         result = _call_grok_api("test prompt")
         assert result == "Hello from Grok"
 
-    @patch("src.data.grok_client.requests.post")
-    def test_api_error(self, mock_post, monkeypatch):
+    @patch("src.data.grok_client._post")
+    def test_api_error(self, mock_post):
         """Returns empty string on HTTP 500."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
-        mock_response = MagicMock()
-        mock_response.status_code = 500
-        mock_post.return_value = mock_response
+        mock_post.return_value = SimpleNamespace(status_code=500)
 
         result = _call_grok_api("test prompt")
         assert result == ""
 
-    @patch("src.data.grok_client.requests.post")
-    def test_timeout(self, mock_post, monkeypatch):
+    @patch("src.data.grok_client._post")
+    def test_timeout(self, mock_post):
         """Returns empty string on timeout."""
         import requests as req
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
         mock_post.side_effect = req.exceptions.Timeout("Timed out")
 
         result = _call_grok_api("test prompt", timeout=1)
         assert result == ""
 
-    @patch("src.data.grok_client.requests.post")
-    def test_request_exception(self, mock_post, monkeypatch):
+    @patch("src.data.grok_client._post")
+    def test_request_exception(self, mock_post):
         """Returns empty string on general request exception."""
         import requests as req
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
         mock_post.side_effect = req.exceptions.ConnectionError("Connection refused")
 
         result = _call_grok_api("test prompt")
         assert result == ""
 
+    @patch("src.data.grok_client._post")
+    def test_concurrent_errors_warn_once(self, mock_post, capsys):
+        """Errors hitting several threads at once print a single warning."""
+        barrier = threading.Barrier(8, timeout=5)
+
+        def fail(*_a, **_k):
+            barrier.wait()
+            return SimpleNamespace(status_code=500)
+
+        mock_post.side_effect = fail
+        threads = [
+            threading.Thread(target=_call_grok_api, args=("test prompt",))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert capsys.readouterr().err.count("[grok_client] API error") == 1
+
 
 # ===================================================================
 # _parse_json_response
@@ -139,6 +167,15 @@ class TestParseJsonResponse:
         result = _parse_json_response("")
         assert result == {}
 
+    def test_trailing_text_with_braces(self):
+        """Stops at the end of the first object even if '}' follows later."""
+        text = '{"key": "value"} (see {note})'
+        assert _parse_json_response(text) == {"key": "value"}
+
+    def test_truncated_json(self):
+        """An object cut off mid-way yields an empty dict, not a nested fragment."""
+        assert _parse_json_response('{"key": {"nested": 1}') == {}
+
 
 # ===================================================================
 # _is_japanese_stock
@@ -181,6 +218,44 @@ class TestContainsJapanese:
         """Mixed text with Japanese chars returns True."""
         assert _contains_japanese("AI半導体") is True
 
+    def test_kana_only(self):
+        """Hiragana/katakana without kanji returns True."""
+        assert _contains_japanese("トヨタ") is True
+        assert _contains_japanese("ひらがな") is True
+
+    def test_range_boundaries(self):
+        """U+3000..U+9FFF inclusive counts; neighbours and empty text do not."""
+        assert _contains_japanese("\u3000") is True
+        assert _contains_japanese("\u9fff") is True
+        assert _contains_japanese("\u2fff\ua000") is False
+        assert _contains_japanese("") is False
+
+
+# ===================================================================
+# _fresh_copy
+# ===================================================================
+
+def _containers(obj):
+    """Yield every dict/list nested in *obj* (including itself)."""
+    if isinstance(obj, (dict, list)):
+        yield obj
+        for value in obj.values() if isinstance(obj, dict) else obj:
+            yield from _containers(value)
+
+
+@pytest.mark.parametrize(
+    "template",
+    [EMPTY_STOCK_DEEP, EMPTY_INDUSTRY, EMPTY_MARKET, EMPTY_TRENDING, EMPTY_BUSINESS],
+    ids=["stock_deep", "industry", "market", "trending", "business"],
+)
+def test_fresh_copy_matches_deepcopy(template):
+    """Equal to copy.deepcopy and shares no dict/list with the template."""
+    result = _fresh_copy(template)
+    assert result == copy.deepcopy(template)
+    assert list(result) == list(template)
+    template_ids = {id(c) for c in _containers(template)}
+    assert not template_ids & {id(c) for c in _containers(result)}
+
 
 # ===================================================================
 # search_stock_deep
@@ -197,10 +272,18 @@ class TestSearchStockDeep:
         assert result["x_sentiment"]["score"] == 0.0
         assert result["raw_response"] == ""
 
-    @patch("src.data.grok_client.requests.post")
-    def test_successful_response(self, mock_post, monkeypatch):
+    def test_empty_result_does_not_alias_template(self, monkeypatch):
+        """Mutating a returned empty result leaves EMPTY_STOCK_DEEP intact."""
+        monkeypatch.delenv("XAI_API_KEY", raising=False)
+        result = search_stock_deep("AAPL")
+        result["recent_news"].append("leak")
+        result["catalysts"]["positive"].append("leak")
+        assert EMPTY_STOCK_DEEP["recent_news"] == []
+        assert EMPTY_STOCK_DEEP["catalysts"]["positive"] == []
+
+    @patch("src.data.grok_client._post")
+    def test_successful_response(self, mock_post):
         """Parses a successful deep research response."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
 
         json_content = json.dumps({
             "recent_news": ["Earnings beat expectations", "New product launch"],
@@ -228,10 +311,9 @@ class TestSearchStockDeep:
         assert result["x_sentiment"]["summary"] == "Bullish sentiment"
         assert result["competitive_notes"] == ["Market leader in segment"]
 
-    @patch("src.data.grok_client.requests.post")
-    def test_japanese_stock_prompt(self, mock_post, monkeypatch):
+    @patch("src.data.grok_client._post")
+    def test_japanese_stock_prompt(self, mock_post):
         """Japanese stock uses Japanese prompt."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
         mock_post.return_value = _make_grok_response("{}")
 
         search_stock_deep("7203.T", "Toyota")
@@ -241,10 +323,9 @@ class TestSearchStockDeep:
         prompt = payload["input"]
         assert "調査" in prompt or "7203.T" in prompt
 
-    @patch("src.data.grok_client.requests.post")
-    def test_us_stock_prompt(self, mock_post, monkeypatch):
+    @patch("src.data.grok_client._post")
+    def test_us_stock_prompt(self, mock_post):
         """US stock uses English prompt."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
         mock_post.return_value = _make_grok_response("{}")
 
         search_stock_deep("AAPL", "Apple Inc.")
@@ -254,10 +335,9 @@ class TestSearchStockDeep:
         prompt = payload["input"]
         assert "Research" in prompt
 
-    @patch("src.data.grok_client.requests.post")
-    def test_malformed_response(self, mock_post, monkeypatch):
+    @patch("src.data.grok_client._post")
+    def test_malformed_response(self, mock_post):
         """Malformed JSON sets raw_response but leaves data empty."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
         mock_post.return_value = _make_grok_response("This is not JSON at all")
 
         result = search_stock_deep("AAPL")
@@ -280,10 +360,9 @@ class TestSearchIndustry:
         assert result["key_players"] == []
         assert result["raw_response"] == ""
 
-    @patch("src.data.grok_client.requests.post")
-    def test_successful_response(self, mock_post, monkeypatch):
+    @patch("src.data.grok_client._post")
+    def test_successful_response(self, mock_post):
         """Parses a successful industry research response."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
 
         json_content = json.dumps({
             "trends": ["AI chip demand surging"],
@@ -307,10 +386,9 @@ class TestSearchIndustry:
         assert result["regulatory"] == ["US export controls"]
         assert result["investor_focus"] == ["CAPEX cycle"]
 
-    @patch("src.data.grok_client.requests.post")
-    def test_japanese_theme(self, mock_post, monkeypatch):
+    @patch("src.data.grok_client._post")
+    def test_japanese_theme(self, mock_post):
         """Japanese theme uses Japanese prompt."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
         mock_post.return_value = _make_grok_response("{}")
 
         search_industry("半導体")
@@ -321,10 +399,9 @@ class TestSearchIndustry:
         assert "半導体" in prompt
         assert "業界" in prompt or "テーマ" in prompt
 
-    @patch("src.data.grok_client.requests.post")
-    def test_english_theme(self, mock_post, monkeypatch):
+    @patch("src.data.grok_client._post")
+    def test_english_theme(self, mock_post):
         """English theme uses English prompt."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
         mock_post.return_value = _make_grok_response("{}")
 
         search_industry("semiconductor")
@@ -350,10 +427,9 @@ class TestSearchMarket:
         assert result["sentiment"]["score"] == 0.0
         assert result["raw_response"] == ""
 
-    @patch("src.data.grok_client.requests.post")
-    def test_successful_response(self, mock_post, monkeypatch):
+    @patch("src.data.grok_client._post")
+    def test_successful_response(self, mock_post):
         """Parses a successful market research response."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
 
         json_content = json.dumps({
             "price_action": "Nikkei rose 1.5% on strong earnings",
@@ -373,6 +449,24 @@ class TestSearchMarket:
         assert result["upcoming_events"] == ["GDP release on Friday"]
         assert result["sector_rotation"] == ["From defensive to cyclical"]
 
+    @patch("src.data.grok_client._post")
+    def test_wrong_field_types_keep_defaults(self, mock_post):
+        """Fields whose type differs from the template are ignored."""
+        json_content = json.dumps({
+            "price_action": ["not", "a", "string"],
+            "macro_factors": "not a list",
+            "upcoming_events": None,
+            "sector_rotation": ["From defensive to cyclical"],
+        })
+        mock_post.return_value = _make_grok_response(json_content)
+
+        result = search_market("日経平均")
+        assert result["price_action"] == ""
+        assert result["macro_factors"] == []
+        assert result["upcoming_events"] == []
+        assert result["sector_rotation"] == ["From defensive to cyclical"]
+        assert list(result) == list(EMPTY_MARKET)
+
 
 # ===================================================================
 # search_business
@@ -390,10 +484,9 @@ class TestSearchBusiness:
         assert result["competitive_advantages"] == []
         assert result["raw_response"] == ""
 
-    @patch("src.data.grok_client.requests.post")
-    def test_successful_response(self, mock_post, monkeypatch):
+    @patch("src.data.grok_client._post")
+    def test_successful_response(self, mock_post):
         """Parses a successful business model response."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
 
         json_content = json.dumps({
             "overview": "Canon is a diversified imaging and optical company",
@@ -421,10 +514,9 @@ class TestSearchBusiness:
         assert len(result["growth_strategy"]) == 2
         assert len(result["risks"]) == 2
 
-    @patch("src.data.grok_client.requests.post")
-    def test_japanese_stock_prompt(self, mock_post, monkeypatch):
+    @patch("src.data.grok_client._post")
+    def test_japanese_stock_prompt(self, mock_post):
         """Japanese stock uses Japanese prompt."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
         mock_post.return_value = _make_grok_response("{}")
 
         search_business("7751.T", "キヤノン")
@@ -434,10 +526,9 @@ class TestSearchBusiness:
         prompt = payload["input"]
         assert "ビジネスモデル" in prompt or "事業概要" in prompt
 
-    @patch("src.data.grok_client.requests.post")
-    def test_us_stock_prompt(self, mock_post, monkeypatch):
+    @patch("src.data.grok_client._post")
+    def test_us_stock_prompt(self, mock_post):
         """US stock uses English prompt."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
         mock_post.return_value = _make_grok_response("{}")
 
         search_business("AAPL", "Apple Inc.")
@@ -447,10 +538,9 @@ class TestSearchBusiness:
         prompt = payload["input"]
         assert "business model" in prompt.lower() or "Analyze" in prompt
 
-    @patch("src.data.grok_client.requests.post")
-    def test_malformed_response(self, mock_post, monkeypatch):
+    @patch("src.data.grok_client._post")
+    def test_malformed_response(self, mock_post):
         """Malformed JSON sets raw_response but leaves data empty."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
         mock_post.return_value = _make_grok_response("This is not JSON at all")
 
         result = search_business("7751.T")
@@ -458,10 +548,9 @@ class TestSearchBusiness:
         assert result["overview"] == ""
         assert result["segments"] == []
 
-    @patch("src.data.grok_client.requests.post")
-    def test_segment_validation(self, mock_post, monkeypatch):
+    @patch("src.data.grok_client._post")
+    def test_segment_validation(self, mock_post):
         """Segments with missing fields get defaults."""
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
 
         json_content = json.dumps({
             "segments": [
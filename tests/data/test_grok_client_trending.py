@@ -3,7 +3,8 @@
 import json
 import sys
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 
@@ -20,11 +21,13 @@ from src.data.grok_client import (
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _make_grok_response(text: str) -> MagicMock:
-    """Build a mock HTTP response that returns *text* as API output."""
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {
+def _make_grok_response(text: str) -> SimpleNamespace:
+    """Build a stub HTTP response that returns *text* as API output.
+
+    _call_grok_api only reads ``status_code`` and calls ``json()``, so a
+    plain namespace is enough (no MagicMock attribute machinery).
+    """
+    payload = {
         "output": [
             {
                 "type": "message",
@@ -34,7 +37,7 @@ def _make_grok_response(text: str) -> MagicMock:
             }
         ]
     }
-    return mock_response
+    return SimpleNamespace(status_code=200, json=lambda: payload)
 
 
 @pytest.fixture(autouse=True)
@@ -44,6 +47,12 @@ def _reset_error_warned():
     yield
 
 
+@pytest.fixture(autouse=True)
+def _xai_key(monkeypatch):
+    """Provide an API key to every test; no-key tests delenv it again."""
+    monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
+
+
 # ===================================================================
 # _build_trending_prompt
 # ===================================================================
@@ -101,9 +110,8 @@ class TestSearchTrendingStocks:
         assert result["market_context"] == ""
         assert result["raw_response"] == ""
 
-    @patch("src.data.grok_client.requests.post")
-    def test_successful_response(self, mock_post, monkeypatch):
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
+    @patch("src.data.grok_client._post")
+    def test_successful_response(self, mock_post):
         payload = {
             "stocks": [
                 {"ticker": "7203.T", "name": "Toyota", "reason": "EV investment"},
@@ -120,9 +128,8 @@ class TestSearchTrendingStocks:
         assert result["stocks"][0]["reason"] == "EV investment"
         assert result["market_context"] == "Bullish on Japanese tech"
 
-    @patch("src.data.grok_client.requests.post")
-    def test_malformed_stocks_filtered(self, mock_post, monkeypatch):
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
+    @patch("src.data.grok_client._post")
+    def test_malformed_stocks_filtered(self, mock_post):
         payload = {
             "stocks": [
                 {"ticker": "7203.T", "name": "Toyota", "reason": "OK"},
@@ -137,9 +144,8 @@ class TestSearchTrendingStocks:
         assert len(result["stocks"]) == 1
         assert result["stocks"][0]["ticker"] == "7203.T"
 
-    @patch("src.data.grok_client.requests.post")
-    def test_theme_in_prompt(self, mock_post, monkeypatch):
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
+    @patch("src.data.grok_client._post")
+    def test_theme_in_prompt(self, mock_post):
         mock_post.return_value = _make_grok_response('{"stocks": [], "market_context": ""}')
 
         search_trending_stocks("us", theme="AI")
@@ -148,28 +154,23 @@ class TestSearchTrendingStocks:
         prompt = call_args[1]["json"]["input"]
         assert "AI" in prompt
 
-    @patch("src.data.grok_client.requests.post")
-    def test_api_error_returns_empty(self, mock_post, monkeypatch):
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
-        mock_resp = MagicMock()
-        mock_resp.status_code = 500
-        mock_post.return_value = mock_resp
+    @patch("src.data.grok_client._post")
+    def test_api_error_returns_empty(self, mock_post):
+        mock_post.return_value = SimpleNamespace(status_code=500)
 
         result = search_trending_stocks("japan")
         assert result["stocks"] == []
 
-    @patch("src.data.grok_client.requests.post")
-    def test_non_json_response(self, mock_post, monkeypatch):
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
+    @patch("src.data.grok_client._post")
+    def test_non_json_response(self, mock_post):
         mock_post.return_value = _make_grok_response("Not JSON at all")
 
         result = search_trending_stocks("japan")
         assert result["stocks"] == []
         assert result["raw_response"] == "Not JSON at all"
 
-    @patch("src.data.grok_client.requests.post")
-    def test_empty_stocks_list(self, mock_post, monkeypatch):
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
+    @patch("src.data.grok_client._post")
+    def test_empty_stocks_list(self, mock_post):
         mock_post.return_value = _make_grok_response(
             '{"stocks": [], "market_context": "No trends"}'
         )
@@ -178,9 +179,8 @@ class TestSearchTrendingStocks:
         assert result["stocks"] == []
         assert result["market_context"] == "No trends"
 
-    @patch("src.data.grok_client.requests.post")
-    def test_ticker_whitespace_stripped(self, mock_post, monkeypatch):
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
+    @patch("src.data.grok_client._post")
+    def test_ticker_whitespace_stripped(self, mock_post):
         payload = {
             "stocks": [{"ticker": " 7203.T ", "name": "Toyota", "reason": "test"}],
             "market_context": "",
@@ -190,9 +190,8 @@ class TestSearchTrendingStocks:
         result = search_trending_stocks("japan")
         assert result["stocks"][0]["ticker"] == "7203.T"
 
-    @patch("src.data.grok_client.requests.post")
-    def test_non_string_name_reason(self, mock_post, monkeypatch):
-        monkeypatch.setenv("XAI_API_KEY", "xai-test-key")
+    @patch("src.data.grok_client._post")
+    def test_non_string_name_reason(self, mock_post):
         payload = {
             "stocks": [{"ticker": "AAPL", "name": 123, "reason": None}],
             "market_context": "",
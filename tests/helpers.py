@@ -0,0 +1,13 @@
+"""Shared price/volume series builders for the core test modules."""
+
+import numpy as np
+
+
+def linear(n: int, base: float, step: float) -> np.ndarray:
+    """base, base+step, ... as a float64 array (n points)."""
+    return base + step * np.arange(n, dtype=np.float64)
+
+
+def flat(n: int, value: float) -> np.ndarray:
+    """n copies of value as a float64 array."""
+    return np.full(n, value, dtype=np.float64)